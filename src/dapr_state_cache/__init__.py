@@ -32,11 +32,11 @@ Com métricas OpenTelemetry:
     ```
 """
 
-__version__ = "0.5.0"
+__version__ = "0.6.0"
 
 # Decorator principal
 # Backend
-from .backend import DaprStateBackend
+from .backend import DaprStateBackend, WriteBatcher
 from .decorator import CacheableWrapper, cacheable
 
 # Deduplicação (uso avançado)
@@ -53,6 +53,9 @@ from .exceptions import (
 # Geração de chaves
 from .key_builder import DefaultKeyBuilder
 
+# Cache local (L1)
+from .local_cache import LocalCache
+
 # Métricas
 from .metrics import (
     CacheMetrics,
@@ -69,7 +72,7 @@ from .protocols import KeyBuilder
 from .protocols import Serializer as SerializerProtocol
 
 # Serialização
-from .serializer import MsgPackSerializer, Serializer
+from .serializer import MsgPackSerializer, MsgspecSerializer, Serializer
 
 __all__ = [
     # Decorator principal
@@ -77,12 +80,16 @@ __all__ = [
     "CacheableWrapper",
     # Backend
     "DaprStateBackend",
+    "WriteBatcher",
     # Serialização
     "MsgPackSerializer",
+    "MsgspecSerializer",
     "Serializer",
     # Geração de chaves
     "DefaultKeyBuilder",
     "KeyBuilder",
+    # Cache local (L1)
+    "LocalCache",
     # Métricas
     "CacheMetrics",
     "CacheStats",
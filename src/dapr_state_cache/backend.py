@@ -2,8 +2,13 @@
 
 import asyncio
 import base64
+import binascii
+import json
 import logging
 import os
+import weakref
+from collections.abc import Callable
+from functools import cache
 from threading import Lock
 from typing import Any
 
@@ -17,6 +22,53 @@ logger = logging.getLogger(__name__)
 DEFAULT_DAPR_HTTP_PORT = 3500
 DEFAULT_TIMEOUT_SECONDS = 5.0
 
+# Configuração do agrupamento de escritas (WriteBatcher)
+DEFAULT_BATCH_MAX_DELAY_SECONDS = 0.001
+DEFAULT_BATCH_MAX_SIZE = 32
+
+# Máximo de operações por transação de remoção em lote
+DELETE_TRANSACTION_CHUNK_SIZE = 500
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _encode_bytes(obj: Any) -> str:
+    """Hook ``default`` do json da stdlib: codifica bytes em base64."""
+    if isinstance(obj, bytes | bytearray | memoryview):
+        return base64.b64encode(obj).decode("ascii")
+    raise TypeError(f"Tipo não serializável em JSON: {type(obj).__name__}")
+
+
+# Encoder pré-configurado: json.dumps com opções não padrão cria um
+# JSONEncoder novo a cada chamada
+_STDLIB_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_encode_bytes)
+
+
+def _stdlib_dumps_json(payload: Any) -> bytes:
+    """Codifica payload com json da stdlib, no formato compacto usado pelo httpx."""
+    return _STDLIB_JSON_ENCODER.encode(payload).encode("utf-8")
+
+
+@cache
+def _json_encoder() -> Callable[[Any], bytes]:
+    """Resolve o encoder JSON na primeira escrita (import lazy de msgspec).
+
+    Usa msgspec.json quando disponível (extra opcional ``msgspec``) e
+    json da stdlib caso contrário. Ambos codificam valores ``bytes`` como
+    string base64; o msgspec escreve o base64 direto no buffer de saída.
+    """
+    try:
+        import msgspec
+    except ImportError:  # pragma: no cover
+        return _stdlib_dumps_json
+    return msgspec.json.Encoder().encode
+
+
+def _dumps_json(payload: Any) -> bytes:
+    """Codifica payload JSON em bytes (valores bytes viram base64)."""
+    return _json_encoder()(payload)
+
 
 def _get_dapr_url() -> str:
     """Obtém a URL base do sidecar Dapr."""
@@ -124,9 +176,61 @@ class DaprStateBackend:
             return f"/v1.0/state/{self._store_name}/{key}"
         return f"/v1.0/state/{self._store_name}"
 
-    def _encode_value(self, value: bytes) -> str:
-        """Codifica valor em base64 para envio via JSON."""
-        return base64.b64encode(value).decode("ascii")
+    def _transaction_url(self) -> str:
+        """Constrói URL da API de transações de state."""
+        return f"/v1.0/state/{self._store_name}/transaction"
+
+    def _delete_transactions(self, keys: list[str]) -> list[bytes]:
+        """Constrói corpos de transação de remoção, em blocos de tamanho limitado."""
+        unique_keys = list(dict.fromkeys(key for key in keys if key))
+        return [
+            _dumps_json(
+                {
+                    "operations": [
+                        {"operation": "delete", "request": {"key": key}}
+                        for key in unique_keys[start : start + DELETE_TRANSACTION_CHUNK_SIZE]
+                    ]
+                }
+            )
+            for start in range(0, len(unique_keys), DELETE_TRANSACTION_CHUNK_SIZE)
+        ]
+
+    def _state_item(self, key: str, value: bytes, ttl_seconds: int) -> dict[str, Any]:
+        """Constrói item do payload de escrita com TTL.
+
+        O valor segue como bytes: o encoder JSON o escreve em base64 diretamente
+        no corpo da requisição, sem strings base64 intermediárias.
+        """
+        return {
+            "key": key,
+            "value": value,
+            "metadata": {"ttlInSeconds": str(ttl_seconds)},
+        }
+
+    def _bulk_payload(self, items: list[tuple[str, bytes, int]]) -> list[dict[str, Any]]:
+        """Constrói payload de escrita em lote, validando as chaves."""
+        payload = []
+        for key, value, ttl_seconds in items:
+            if not key:
+                raise CacheKeyError("Chave não pode ser vazia", key=key)
+            payload.append(self._state_item(key, value, ttl_seconds))
+        return payload
+
+    def _decode_response(self, content: bytes) -> bytes | None:
+        """Decodifica corpo de resposta do Dapr (valor em base64).
+
+        Corpos ASCII (caso normal, base64) são decodificados direto dos bytes,
+        sem a cópia intermediária para str.
+
+        Raises:
+            UnicodeDecodeError: Se o corpo não for UTF-8 válido
+        """
+        if content.isascii():
+            try:
+                return base64.b64decode(content)
+            except binascii.Error:
+                return content
+        return self._decode_value(content.decode("utf-8"))
 
     def _decode_value(self, data: Any) -> bytes | None:
         """Decodifica valor recebido do Dapr."""
@@ -170,8 +274,7 @@ class DaprStateBackend:
                 logger.debug(f"Cache hit para chave: {key}")
                 # Dapr retorna o valor como string (base64 encoded)
                 try:
-                    value_str = response.content.decode("utf-8")
-                    return self._decode_value(value_str)
+                    return self._decode_response(response.content)
                 except UnicodeDecodeError as e:
                     logger.warning(f"Erro ao decodificar resposta para chave {key}: {e}")
                     return None
@@ -204,14 +307,8 @@ class DaprStateBackend:
 
         try:
             client = self._get_sync_client()
-            payload = [
-                {
-                    "key": key,
-                    "value": self._encode_value(value),
-                    "metadata": {"ttlInSeconds": str(ttl_seconds)},
-                }
-            ]
-            response = client.post(self._state_url(), json=payload)
+            payload = [self._state_item(key, value, ttl_seconds)]
+            response = client.post(self._state_url(), content=_dumps_json(payload), headers=_JSON_HEADERS)
 
             if response.status_code in (200, 201, 204):
                 logger.debug(f"Cache set para chave: {key}, TTL: {ttl_seconds}s")
@@ -226,6 +323,40 @@ class DaprStateBackend:
             logger.warning(f"Timeout ao salvar chave {key}: {e}")
             return False
 
+    def set_many(self, items: list[tuple[str, bytes, int]]) -> bool:
+        """Armazena vários valores em uma única requisição (síncrono).
+
+        Args:
+            items: Tuplas (chave, valor em bytes, TTL em segundos)
+
+        Returns:
+            True se todos foram armazenados com sucesso
+
+        Raises:
+            CacheKeyError: Se alguma chave for vazia
+            CacheConnectionError: Se não conseguir conectar ao sidecar
+        """
+        if not items:
+            return True
+        payload = self._bulk_payload(items)
+
+        try:
+            client = self._get_sync_client()
+            response = client.post(self._state_url(), content=_dumps_json(payload), headers=_JSON_HEADERS)
+
+            if response.status_code in (200, 201, 204):
+                logger.debug(f"Cache set em lote: {len(payload)} chaves")
+                return True
+
+            logger.warning(f"Falha ao salvar cache em lote: {response.status_code}")
+            return False
+
+        except httpx.ConnectError as e:
+            raise CacheConnectionError(f"Não foi possível conectar ao sidecar Dapr: {e}") from e
+        except httpx.TimeoutException as e:
+            logger.warning(f"Timeout ao salvar {len(payload)} chaves em lote: {e}")
+            return False
+
     def delete(self, key: str) -> bool:
         """Remove valor do cache (síncrono).
 
@@ -250,6 +381,37 @@ class DaprStateBackend:
             logger.warning(f"Erro ao deletar chave {key}: {e}")
             return False
 
+    def delete_many(self, keys: list[str]) -> bool:
+        """Remove várias chaves via transação de state (síncrono).
+
+        Envia uma transação por bloco de até DELETE_TRANSACTION_CHUNK_SIZE
+        chaves, em vez de uma requisição por chave. Requer state store
+        com suporte a transações. Chaves vazias e duplicadas são ignoradas.
+
+        Args:
+            keys: Chaves do cache
+
+        Returns:
+            True se todas as transações foram confirmadas
+        """
+        bodies = self._delete_transactions(keys)
+        if not bodies:
+            return True
+
+        try:
+            client = self._get_sync_client()
+            for body in bodies:
+                response = client.post(self._transaction_url(), content=body, headers=_JSON_HEADERS)
+                if response.status_code not in (200, 204):
+                    logger.warning(f"Falha ao deletar chaves em lote: {response.status_code}")
+                    return False
+            logger.debug(f"Cache delete em lote: {len(keys)} chaves")
+            return True
+
+        except httpx.HTTPError as e:
+            logger.warning(f"Erro ao deletar {len(keys)} chaves em lote: {e}")
+            return False
+
     # ========== Métodos Assíncronos ==========
 
     async def get_async(self, key: str) -> bytes | None:
@@ -279,8 +441,7 @@ class DaprStateBackend:
                 logger.debug(f"Cache hit para chave: {key}")
                 # Dapr retorna o valor como string (base64 encoded)
                 try:
-                    value_str = response.content.decode("utf-8")
-                    return self._decode_value(value_str)
+                    return self._decode_response(response.content)
                 except UnicodeDecodeError as e:
                     logger.warning(f"Erro ao decodificar resposta para chave {key}: {e}")
                     return None
@@ -313,14 +474,8 @@ class DaprStateBackend:
 
         try:
             client = await self._get_async_client()
-            payload = [
-                {
-                    "key": key,
-                    "value": self._encode_value(value),
-                    "metadata": {"ttlInSeconds": str(ttl_seconds)},
-                }
-            ]
-            response = await client.post(self._state_url(), json=payload)
+            payload = [self._state_item(key, value, ttl_seconds)]
+            response = await client.post(self._state_url(), content=_dumps_json(payload), headers=_JSON_HEADERS)
 
             if response.status_code in (200, 201, 204):
                 logger.debug(f"Cache set para chave: {key}, TTL: {ttl_seconds}s")
@@ -335,6 +490,40 @@ class DaprStateBackend:
             logger.warning(f"Timeout ao salvar chave {key}: {e}")
             return False
 
+    async def set_many_async(self, items: list[tuple[str, bytes, int]]) -> bool:
+        """Armazena vários valores em uma única requisição (assíncrono).
+
+        Args:
+            items: Tuplas (chave, valor em bytes, TTL em segundos)
+
+        Returns:
+            True se todos foram armazenados com sucesso
+
+        Raises:
+            CacheKeyError: Se alguma chave for vazia
+            CacheConnectionError: Se não conseguir conectar ao sidecar
+        """
+        if not items:
+            return True
+        payload = self._bulk_payload(items)
+
+        try:
+            client = await self._get_async_client()
+            response = await client.post(self._state_url(), content=_dumps_json(payload), headers=_JSON_HEADERS)
+
+            if response.status_code in (200, 201, 204):
+                logger.debug(f"Cache set em lote: {len(payload)} chaves")
+                return True
+
+            logger.warning(f"Falha ao salvar cache em lote: {response.status_code}")
+            return False
+
+        except httpx.ConnectError as e:
+            raise CacheConnectionError(f"Não foi possível conectar ao sidecar Dapr: {e}") from e
+        except httpx.TimeoutException as e:
+            logger.warning(f"Timeout ao salvar {len(payload)} chaves em lote: {e}")
+            return False
+
     async def delete_async(self, key: str) -> bool:
         """Remove valor do cache (assíncrono).
 
@@ -359,6 +548,37 @@ class DaprStateBackend:
             logger.warning(f"Erro ao deletar chave {key}: {e}")
             return False
 
+    async def delete_many_async(self, keys: list[str]) -> bool:
+        """Remove várias chaves via transação de state (assíncrono).
+
+        Envia uma transação por bloco de até DELETE_TRANSACTION_CHUNK_SIZE
+        chaves, em vez de uma requisição por chave. Requer state store
+        com suporte a transações. Chaves vazias e duplicadas são ignoradas.
+
+        Args:
+            keys: Chaves do cache
+
+        Returns:
+            True se todas as transações foram confirmadas
+        """
+        bodies = self._delete_transactions(keys)
+        if not bodies:
+            return True
+
+        try:
+            client = await self._get_async_client()
+            for body in bodies:
+                response = await client.post(self._transaction_url(), content=body, headers=_JSON_HEADERS)
+                if response.status_code not in (200, 204):
+                    logger.warning(f"Falha ao deletar chaves em lote: {response.status_code}")
+                    return False
+            logger.debug(f"Cache delete em lote: {len(keys)} chaves")
+            return True
+
+        except httpx.HTTPError as e:
+            logger.warning(f"Erro ao deletar {len(keys)} chaves em lote: {e}")
+            return False
+
     # ========== Gerenciamento de Recursos ==========
 
     def close(self) -> None:
@@ -384,3 +604,109 @@ class DaprStateBackend:
 
     async def __aexit__(self, *args: object) -> None:
         await self.aclose()
+
+
+class _LoopBatch:
+    """Lote em formação, timer e envios em andamento de um event loop."""
+
+    __slots__ = ("flush_handle", "flush_tasks", "pending")
+
+    def __init__(self) -> None:
+        self.pending: list[tuple[str, bytes, int, asyncio.Future[bool]]] = []
+        self.flush_handle: asyncio.TimerHandle | None = None
+        self.flush_tasks: set[asyncio.Task[None]] = set()
+
+
+class WriteBatcher:
+    """Agrupa escritas assíncronas concorrentes em um único POST ao sidecar.
+
+    Escritas feitas dentro de uma janela curta (``max_delay``) são enviadas
+    juntas via ``set_many_async``. O lote é enviado antes do fim da janela
+    se atingir ``max_size`` itens. Cada chamador recebe o resultado do lote.
+
+    O batcher é compartilhado por processo, mas cada event loop tem o seu
+    próprio lote e timer: escritas de loops diferentes (ex.: threads com
+    ``asyncio.run`` próprio) nunca são misturadas nem descartadas.
+
+    Attributes:
+        backend: Backend usado para enviar os lotes
+    """
+
+    def __init__(
+        self,
+        backend: DaprStateBackend,
+        max_delay: float = DEFAULT_BATCH_MAX_DELAY_SECONDS,
+        max_size: int = DEFAULT_BATCH_MAX_SIZE,
+    ) -> None:
+        """Inicializa o batcher.
+
+        Args:
+            backend: Backend Dapr
+            max_delay: Janela máxima de espera antes de enviar o lote (segundos)
+            max_size: Tamanho máximo do lote
+        """
+        self._backend = backend
+        self._max_delay = max_delay
+        self._max_size = max_size
+        # Estado por event loop; a entrada sai junto com o loop
+        self._batches: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopBatch] = weakref.WeakKeyDictionary()
+        self._batches_lock = Lock()
+
+    def _batch_for(self, loop: asyncio.AbstractEventLoop) -> _LoopBatch:
+        """Retorna o lote do event loop, criando-o no primeiro uso."""
+        with self._batches_lock:
+            batch = self._batches.get(loop)
+            if batch is None:
+                batch = self._batches[loop] = _LoopBatch()
+            return batch
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> bool:
+        """Enfileira escrita e aguarda o envio do lote.
+
+        Returns:
+            True se o lote foi armazenado com sucesso
+
+        Raises:
+            CacheConnectionError: Se não conseguir conectar ao sidecar
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batch_for(loop)
+        future: asyncio.Future[bool] = loop.create_future()
+        batch.pending.append((key, value, ttl_seconds, future))
+
+        if len(batch.pending) >= self._max_size:
+            self._schedule_flush(batch)
+        elif batch.flush_handle is None:
+            batch.flush_handle = loop.call_later(self._max_delay, self._schedule_flush, batch)
+
+        return await future
+
+    def _schedule_flush(self, batch: _LoopBatch) -> None:
+        """Retira o lote atual da fila e agenda seu envio."""
+        if batch.flush_handle is not None:
+            batch.flush_handle.cancel()
+            batch.flush_handle = None
+        items, batch.pending = batch.pending, []
+        if items:
+            task = asyncio.get_running_loop().create_task(self._flush(items))
+            # Mantém referência forte até o fim do envio
+            batch.flush_tasks.add(task)
+            task.add_done_callback(batch.flush_tasks.discard)
+
+    async def _flush(self, batch: list[tuple[str, bytes, int, asyncio.Future[bool]]]) -> None:
+        """Envia o lote e resolve as futures dos chamadores."""
+        # Escritas canceladas antes do envio (ex.: invalidação da chave) são descartadas
+        batch = [item for item in batch if not item[3].cancelled()]
+        if not batch:
+            return
+        try:
+            result = await self._backend.set_many_async([(key, value, ttl) for key, value, ttl, _ in batch])
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for *_, future in batch:
+            if not future.done():
+                future.set_result(result)
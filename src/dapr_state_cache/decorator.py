@@ -1,26 +1,34 @@
 """Decorator @cacheable para cache transparente."""
 
+import asyncio
 import inspect
 import logging
 import time
-from collections.abc import Callable
-from functools import wraps
+from collections.abc import Callable, Iterable
+from functools import partial, wraps
 from typing import Any, overload
 
-from .backend import DaprStateBackend
+from .backend import DaprStateBackend, WriteBatcher
 from .deduplication import DeduplicationManager
 from .key_builder import DefaultKeyBuilder
-from .protocols import KeyBuilder
+from .local_cache import LocalCache
 from .metrics import CacheMetrics, NoOpMetrics
-from .serializer import MsgPackSerializer, Serializer
+from .protocols import KeyBuilder, Serializer
+from .serializer import MsgPackSerializer
 
 logger = logging.getLogger(__name__)
 
+# Relógio usado para medir latência (alias do módulo para permitir substituição em testes)
+_clock = time.perf_counter
+
 # Valores padrão
 DEFAULT_STORE_NAME = "cache"
 DEFAULT_TTL_SECONDS = 3600
 DEFAULT_KEY_PREFIX = "cache"
 
+# Fração do TTL usada no L1 para valores lidos do Dapr, cujo tempo restante lá é desconhecido
+LOCAL_CACHE_READ_TTL_FRACTION = 0.1
+
 
 class CacheableWrapper:
     """Wrapper para funções decoradas com @cacheable.
@@ -37,6 +45,9 @@ class CacheableWrapper:
         key_builder: Construtor de chaves
         ttl_seconds: TTL padrão
         metrics: Coletor de métricas
+        write_batcher: Agrupador de escritas async (opcional)
+        local_cache: Cache L1 em processo consultado antes do Dapr (opcional)
+        background_writes: Escritas async no miss não atrasam o retorno ao chamador
     """
 
     def __init__(
@@ -48,16 +59,34 @@ class CacheableWrapper:
         ttl_seconds: int,
         metrics: CacheMetrics | NoOpMetrics,
         deduplication: DeduplicationManager | None = None,
+        write_batcher: WriteBatcher | None = None,
+        local_cache: LocalCache | None = None,
+        background_writes: bool = False,
     ) -> None:
         self._func = func
         self._backend = backend
-        self._serializer = serializer
-        self._key_builder = key_builder
         self._ttl_seconds = ttl_seconds
-        self._metrics = metrics
+        # Valor lido do Dapr pode estar perto de expirar lá: fica pouco tempo no L1
+        self._local_read_ttl_seconds = max(1, int(ttl_seconds * LOCAL_CACHE_READ_TTL_FRACTION))
         self._deduplication = deduplication or DeduplicationManager()
+        self._write_batcher = write_batcher
+        self._local_cache = local_cache
+        self._background_writes = background_writes
+        # Escrita em segundo plano pendente por chave (referência forte até a conclusão);
+        # a invalidação da chave aguarda ou cancela essa escrita antes de remover
+        self._write_tasks: dict[str, asyncio.Task[None]] = {}
         self._is_async = inspect.iscoroutinefunction(func)
 
+        # Resolve os métodos usados em toda chamada uma única vez (decoration time),
+        # evitando cadeias de atributos no hot path
+        self._build_key = key_builder.build_key
+        self._serialize = serializer.serialize
+        self._deserialize = serializer.deserialize
+        self._record_hit = metrics.record_hit
+        self._record_miss = metrics.record_miss
+        self._record_write = metrics.record_write
+        self._record_error = metrics.record_error
+
         # Preserva metadados da função original
         wraps(func)(self)
 
@@ -73,69 +102,102 @@ class CacheableWrapper:
             return self._call_async(*args, **kwargs)
         return self._call_sync(*args, **kwargs)
 
+    def _get_cached(self, cache_key: str) -> bytes | None:
+        """Busca no cache local (se habilitado) e depois no backend (sync)."""
+        if self._local_cache is not None:
+            cached_data = self._local_cache.get(cache_key)
+            if cached_data is not None:
+                return cached_data
+        cached_data = self._backend.get(cache_key)
+        if cached_data is not None:
+            self._store_local(cache_key, cached_data, self._local_read_ttl_seconds)
+        return cached_data
+
+    async def _get_cached_async(self, cache_key: str) -> bytes | None:
+        """Busca no cache local (se habilitado) e depois no backend (async)."""
+        if self._local_cache is not None:
+            cached_data = self._local_cache.get(cache_key)
+            if cached_data is not None:
+                return cached_data
+        cached_data = await self._backend.get_async(cache_key)
+        if cached_data is not None:
+            self._store_local(cache_key, cached_data, self._local_read_ttl_seconds)
+        return cached_data
+
+    def _store_local(self, cache_key: str, data: bytes, ttl_seconds: int | None = None) -> None:
+        """Armazena valor serializado no cache local, se habilitado (default: TTL completo)."""
+        if self._local_cache is not None:
+            self._local_cache.set(cache_key, data, self._ttl_seconds if ttl_seconds is None else ttl_seconds)
+
     def _call_sync(self, *args: Any, **kwargs: Any) -> Any:
-        """Execução síncrona com cache."""
-        cache_key = self._key_builder.build_key(self._func, args, kwargs)
-        start_time = time.perf_counter()
+        """Execução síncrona com cache e deduplicação."""
+        cache_key = self._build_key(self._func, args, kwargs)
+        start_time = _clock()
         cache_error_occurred = False
 
         # Tenta buscar do cache
         try:
-            cached_data = self._backend.get(cache_key)
+            cached_data = self._get_cached(cache_key)
             if cached_data is not None:
-                result = self._serializer.deserialize(cached_data)
-                latency = time.perf_counter() - start_time
-                self._metrics.record_hit(cache_key, latency)
+                result = self._deserialize(cached_data)
+                latency = _clock() - start_time
+                self._record_hit(cache_key, latency)
                 logger.debug(f"Cache hit: {cache_key}")
                 return result
         except Exception as e:
             logger.warning(f"Erro ao buscar cache: {e}")
-            self._metrics.record_error(cache_key, e)
+            self._record_error(cache_key, e)
             cache_error_occurred = True
 
-        # Cache miss - executa função (só registra miss se não houve erro)
-        latency = time.perf_counter() - start_time
+        # Cache miss - executa com deduplicação entre threads (só registra miss se não houve erro)
+        latency = _clock() - start_time
         if not cache_error_occurred:
-            self._metrics.record_miss(cache_key, latency)
+            self._record_miss(cache_key, latency)
             logger.debug(f"Cache miss: {cache_key}")
 
-        result = self._func(*args, **kwargs)
+        func = self._func
 
-        # Armazena no cache
-        try:
-            serialized = self._serializer.serialize(result)
-            self._backend.set(cache_key, serialized, self._ttl_seconds)
-            self._metrics.record_write(cache_key, len(serialized))
-        except Exception as e:
-            logger.warning(f"Erro ao salvar cache: {e}")
-            self._metrics.record_error(cache_key, e)
+        def compute_and_cache() -> Any:
+            result = func(*args, **kwargs)
+
+            # Armazena no cache
+            try:
+                serialized = self._serialize(result)
+                self._backend.set(cache_key, serialized, self._ttl_seconds)
+                self._store_local(cache_key, serialized)
+                self._record_write(cache_key, len(serialized))
+            except Exception as e:
+                logger.warning(f"Erro ao salvar cache: {e}")
+                self._record_error(cache_key, e)
+
+            return result
 
-        return result
+        return self._deduplication.deduplicate_sync(cache_key, compute_and_cache)
 
     async def _call_async(self, *args: Any, **kwargs: Any) -> Any:
         """Execução assíncrona com cache e deduplicação."""
-        cache_key = self._key_builder.build_key(self._func, args, kwargs)
-        start_time = time.perf_counter()
+        cache_key = self._build_key(self._func, args, kwargs)
+        start_time = _clock()
         cache_error_occurred = False
 
         # Tenta buscar do cache
         try:
-            cached_data = await self._backend.get_async(cache_key)
+            cached_data = await self._get_cached_async(cache_key)
             if cached_data is not None:
-                result = self._serializer.deserialize(cached_data)
-                latency = time.perf_counter() - start_time
-                self._metrics.record_hit(cache_key, latency)
+                result = self._deserialize(cached_data)
+                latency = _clock() - start_time
+                self._record_hit(cache_key, latency)
                 logger.debug(f"Cache hit: {cache_key}")
                 return result
         except Exception as e:
             logger.warning(f"Erro ao buscar cache: {e}")
-            self._metrics.record_error(cache_key, e)
+            self._record_error(cache_key, e)
             cache_error_occurred = True
 
         # Cache miss - executa com deduplicação (só registra miss se não houve erro)
-        latency = time.perf_counter() - start_time
+        latency = _clock() - start_time
         if not cache_error_occurred:
-            self._metrics.record_miss(cache_key, latency)
+            self._record_miss(cache_key, latency)
             logger.debug(f"Cache miss: {cache_key}")
 
         # Captura func localmente para type checker
@@ -144,32 +206,144 @@ class CacheableWrapper:
         async def compute_and_cache() -> Any:
             result = await func(*args, **kwargs)  # type: ignore[misc]
 
-            # Armazena no cache
             try:
-                serialized = self._serializer.serialize(result)
-                await self._backend.set_async(cache_key, serialized, self._ttl_seconds)
-                self._metrics.record_write(cache_key, len(serialized))
+                serialized = self._serialize(result)
             except Exception as e:
                 logger.warning(f"Erro ao salvar cache: {e}")
-                self._metrics.record_error(cache_key, e)
+                self._record_error(cache_key, e)
+                return result
+
+            # Armazena no cache
+            if self._background_writes:
+                self._start_background_write(cache_key, serialized)
+            else:
+                await self._write_async(cache_key, serialized)
 
             return result
 
         return await self._deduplication.deduplicate(cache_key, compute_and_cache)
 
+    async def _write_async(self, cache_key: str, serialized: bytes) -> None:
+        """Grava valor serializado no backend (ou batcher) e no cache local (async)."""
+        try:
+            if self._write_batcher is not None:
+                await self._write_batcher.set(cache_key, serialized, self._ttl_seconds)
+            else:
+                await self._backend.set_async(cache_key, serialized, self._ttl_seconds)
+            self._store_local(cache_key, serialized)
+            self._record_write(cache_key, len(serialized))
+        except Exception as e:
+            logger.warning(f"Erro ao salvar cache: {e}")
+            self._record_error(cache_key, e)
+
+    def _start_background_write(self, cache_key: str, serialized: bytes) -> None:
+        """Agenda a escrita da chave em segundo plano, substituindo uma escrita anterior pendente."""
+        previous = self._write_tasks.get(cache_key)
+        if previous is not None:
+            previous.cancel()
+        task = asyncio.get_running_loop().create_task(self._write_async(cache_key, serialized))
+        self._write_tasks[cache_key] = task
+        task.add_done_callback(partial(self._discard_write, cache_key))
+
+    def _discard_write(self, cache_key: str, task: asyncio.Task[None]) -> None:
+        """Remove a escrita concluída do registro (se ainda for a registrada para a chave)."""
+        if self._write_tasks.get(cache_key) is task:
+            del self._write_tasks[cache_key]
+
+    def _settle_pending_writes(self, keys: Iterable[str]) -> None:
+        """Aguarda escritas em segundo plano pendentes das chaves (invalidação sync).
+
+        Fora da thread do loop, bloqueia até a escrita terminar no próprio loop,
+        para que ela não seja aplicada pelo Dapr depois do delete. Na thread do
+        loop não é possível bloquear sem travá-lo: a escrita é cancelada.
+        """
+        by_loop: dict[asyncio.AbstractEventLoop, set[asyncio.Task[None]]] = {}
+        for cache_key in keys:
+            task = self._write_tasks.get(cache_key)
+            if task is not None and not task.done():
+                by_loop.setdefault(task.get_loop(), set()).add(task)
+        if not by_loop:
+            return
+
+        try:
+            running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        for loop, tasks in by_loop.items():
+            if loop is running_loop or not loop.is_running():
+                for task in tasks:
+                    task.cancel()
+            else:
+                asyncio.run_coroutine_threadsafe(asyncio.wait(tasks), loop).result()
+
+    async def _await_pending_writes(self, keys: Iterable[str]) -> None:
+        """Aguarda escritas em segundo plano pendentes das chaves (invalidação async).
+
+        Aguardar (em vez de cancelar) garante que a escrita já foi aplicada pelo
+        Dapr antes do delete, então ela não pode ressuscitar o valor antigo.
+        """
+        pending = {task for cache_key in keys if (task := self._write_tasks.get(cache_key)) is not None}
+        if pending:
+            # asyncio.wait não propaga exceções nem cancela as escritas se a invalidação for cancelada
+            await asyncio.wait(pending)
+
+    def _delete_local(self, keys: Iterable[str]) -> None:
+        """Remove as chaves do cache local, se habilitado."""
+        if self._local_cache is not None:
+            for cache_key in keys:
+                self._local_cache.delete(cache_key)
+
     def invalidate(self, *args: Any, **kwargs: Any) -> bool:
         """Invalida entrada de cache para os argumentos especificados (sync)."""
-        cache_key = self._key_builder.build_key(self._func, args, kwargs)
-        return self._backend.delete(cache_key)
+        keys = [self._build_key(self._func, args, kwargs)]
+        self._settle_pending_writes(keys)
+        self._delete_local(keys)
+        return self._backend.delete(keys[0])
 
     async def invalidate_async(self, *args: Any, **kwargs: Any) -> bool:
         """Invalida entrada de cache para os argumentos especificados (async)."""
-        cache_key = self._key_builder.build_key(self._func, args, kwargs)
-        return await self._backend.delete_async(cache_key)
+        keys = [self._build_key(self._func, args, kwargs)]
+        await self._await_pending_writes(keys)
+        self._delete_local(keys)
+        return await self._backend.delete_async(keys[0])
+
+    def _build_keys(self, calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]]) -> list[str]:
+        """Constrói as chaves de várias chamadas."""
+        return [self._build_key(self._func, args, kwargs) for args, kwargs in calls]
+
+    def invalidate_many(self, calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]]) -> bool:
+        """Invalida várias entradas de cache em lote (sync).
+
+        Cada item de ``calls`` é um par ``(args, kwargs)``. As chaves são
+        removidas em uma única transação do Dapr, em vez de uma requisição
+        por chave.
+
+        Example:
+            ```python
+            get_user.invalidate_many([((1,), {}), ((2,), {})])
+            ```
+        """
+        keys = self._build_keys(calls)
+        self._settle_pending_writes(keys)
+        self._delete_local(keys)
+        return self._backend.delete_many(keys)
+
+    async def invalidate_many_async(self, calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]]) -> bool:
+        """Invalida várias entradas de cache em lote (async)."""
+        keys = self._build_keys(calls)
+        await self._await_pending_writes(keys)
+        self._delete_local(keys)
+        return await self._backend.delete_many_async(keys)
 
 
 class BoundCacheableMethod:
-    """Wrapper para métodos bound (com self/cls)."""
+    """Wrapper para métodos bound (com self/cls).
+
+    Criado a cada acesso ao método pela instância; ``__slots__`` mantém
+    a alocação barata e a leitura dos atributos sem lookup em ``__dict__``.
+    """
+
+    __slots__ = ("_instance", "_wrapper")
 
     def __init__(self, wrapper: CacheableWrapper, instance: Any) -> None:
         self._wrapper = wrapper
@@ -187,6 +361,14 @@ class BoundCacheableMethod:
         """Invalida cache para este método (async)."""
         return await self._wrapper.invalidate_async(self._instance, *args, **kwargs)
 
+    def invalidate_many(self, calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]]) -> bool:
+        """Invalida várias entradas de cache deste método em lote (sync)."""
+        return self._wrapper.invalidate_many(((self._instance, *args), kwargs) for args, kwargs in calls)
+
+    async def invalidate_many_async(self, calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]]) -> bool:
+        """Invalida várias entradas de cache deste método em lote (async)."""
+        return await self._wrapper.invalidate_many_async(((self._instance, *args), kwargs) for args, kwargs in calls)
+
 
 # Cache de backends por store_name para reutilização (thread-safe via setdefault)
 _backends: dict[str, DaprStateBackend] = {}
@@ -203,6 +385,18 @@ def _get_backend(store_name: str) -> DaprStateBackend:
     return backend
 
 
+# Batchers de escrita por store_name, compartilhados entre decorators com batch_writes=True
+_write_batchers: dict[str, WriteBatcher] = {}
+
+
+def _get_write_batcher(store_name: str) -> WriteBatcher:
+    """Obtém ou cria o WriteBatcher do store (thread-safe via setdefault)."""
+    batcher = _write_batchers.get(store_name)
+    if batcher is None:
+        batcher = _write_batchers.setdefault(store_name, WriteBatcher(_get_backend(store_name)))
+    return batcher
+
+
 @overload
 def cacheable(func: Callable[..., Any]) -> CacheableWrapper: ...
 
@@ -216,6 +410,9 @@ def cacheable(
     key_builder: KeyBuilder | None = None,
     serializer: Serializer | None = None,
     metrics: CacheMetrics | NoOpMetrics | None = None,
+    batch_writes: bool = False,
+    local_cache_size: int = 0,
+    background_writes: bool = False,
 ) -> Callable[[Callable[..., Any]], CacheableWrapper]: ...
 
 
@@ -228,6 +425,9 @@ def cacheable(
     key_builder: KeyBuilder | None = None,
     serializer: Serializer | None = None,
     metrics: CacheMetrics | NoOpMetrics | None = None,
+    batch_writes: bool = False,
+    local_cache_size: int = 0,
+    background_writes: bool = False,
 ) -> CacheableWrapper | Callable[[Callable[..., Any]], CacheableWrapper]:
     """Decorator para adicionar cache transparente a funções.
 
@@ -242,6 +442,20 @@ def cacheable(
         key_builder: Construtor de chaves customizado
         serializer: Serializer customizado (default: MsgPackSerializer)
         metrics: Coletor de métricas (default: NoOpMetrics)
+        batch_writes: Agrupa escritas async concorrentes do mesmo store em
+            um único POST ao sidecar (default: False)
+        local_cache_size: Entradas do cache L1 em processo consultado antes
+            do Dapr; 0 desabilita (default: 0). Valores gravados por este
+            processo ficam no L1 pelo mesmo TTL; valores lidos do Dapr, por 10%
+            do TTL (mínimo 1s), pois o tempo restante lá é desconhecido. Assim
+            um valor pode ser servido até ~1,1x o TTL após ser gravado. Entradas
+            L1 não são invalidadas por outros processos.
+        background_writes: Em funções async, retorna o resultado do miss sem
+            aguardar a escrita no Dapr, que segue em segundo plano; falhas são
+            registradas nas métricas (default: False). Chamadas logo após o
+            retorno podem não ver o valor gravado ainda. A invalidação de uma
+            chave aguarda sua escrita pendente (sync chamada na própria thread
+            do loop apenas a cancela).
 
     Returns:
         Função decorada com cache
@@ -277,6 +491,9 @@ def cacheable(
             key_builder=actual_key_builder,
             ttl_seconds=ttl_seconds,
             metrics=actual_metrics,
+            write_batcher=_get_write_batcher(store_name) if batch_writes else None,
+            local_cache=LocalCache(local_cache_size) if local_cache_size > 0 else None,
+            background_writes=background_writes,
         )
 
     if func is not None:
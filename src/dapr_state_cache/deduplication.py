@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
-from collections.abc import Awaitable, Callable
+import threading
+from collections.abc import Callable, Coroutine
+from functools import partial
 from typing import Any, TypeVar
 
 logger = logging.getLogger(__name__)
@@ -10,6 +12,22 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+# Marca uma computação síncrona que terminou sem resultado nem Exception
+_NO_RESULT: Any = object()
+
+
+class _SyncCall:
+    """Computação síncrona em andamento compartilhada entre threads."""
+
+    __slots__ = ("error", "event", "owner", "result")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.owner = threading.get_ident()
+        self.result: Any = _NO_RESULT
+        self.error: Exception | None = None
+
+
 class DeduplicationManager:
     """Gerenciador de deduplicação para evitar thundering herd.
 
@@ -18,6 +36,7 @@ class DeduplicationManager:
     compartilhado com todas as chamadas aguardando.
 
     Isso evita computações redundantes e reduz carga no sistema.
+    ``deduplicate`` atende corrotinas; ``deduplicate_sync`` atende threads.
 
     Exemplo:
         ```python
@@ -37,31 +56,24 @@ class DeduplicationManager:
 
     def __init__(self) -> None:
         """Inicializa o gerenciador de deduplicação."""
-        self._pending: dict[str, asyncio.Future[Any]] = {}
-        # asyncio.Lock é criado lazy para evitar "no current event loop" em Python 3.10+
-        # quando a classe é instanciada antes de um event loop existir (ex: tempo de decorator)
-        self._lock: asyncio.Lock | None = None
-
-    def _get_lock(self) -> asyncio.Lock:
-        """Obtém ou cria lock assíncrono (lazy init).
-
-        Cria o asyncio.Lock na primeira chamada async, quando já existe
-        um event loop ativo. Evita RuntimeError em Python 3.10+ quando
-        a classe é instanciada antes de um event loop existir.
-        """
-        if self._lock is None:
-            self._lock = asyncio.Lock()
-        return self._lock
+        # Registro e remoção de tasks não contêm await: são atômicos no event loop,
+        # então nenhum lock é necessário; a própria Task é o ponto de encontro.
+        self._pending: dict[str, asyncio.Task[Any]] = {}
+        # Variante síncrona: threads concorrentes aguardam um threading.Event
+        self._pending_sync: dict[str, _SyncCall] = {}
+        self._sync_lock = threading.Lock()
 
     async def deduplicate(
         self,
         key: str,
-        compute_func: Callable[[], Awaitable[T]],
+        compute_func: Callable[[], Coroutine[Any, Any, T]],
     ) -> T:
         """Executa computação com deduplicação.
 
-        Se já existe uma computação em andamento para a mesma chave,
-        aguarda e retorna o mesmo resultado.
+        A computação roda em uma Task compartilhada por chave; todas as
+        chamadas concorrentes aguardam a mesma Task via ``asyncio.shield``.
+        Assim, cancelar um chamador (inclusive o primeiro) não cancela a
+        computação nem deixa os demais waiters esperando para sempre.
 
         Args:
             key: Chave de deduplicação (normalmente a cache key)
@@ -73,62 +85,87 @@ class DeduplicationManager:
         Raises:
             Exception: Propaga exceções da computação para todos os waiters
         """
-        # Verifica se já existe computação pendente e registra nova se não existir
-        # Tudo em um único lock para evitar race conditions
-        future: asyncio.Future[T] | None = None
-        pending_future: asyncio.Future[Any] | None = None
-
-        async with self._get_lock():
-            pending_future = self._pending.get(key)
-            if pending_future is None:
-                # Não há computação pendente - esta task será responsável
-                # Cria future para esta computação (usando get_running_loop() para Python 3.12+)
-                future = asyncio.get_running_loop().create_future()
-                self._pending[key] = future
-            else:
-                logger.debug(f"Aguardando computação existente para: {key}")
-                # IMPORTANTE: Apenas captura a referência, NÃO await dentro do lock!
-                # A task que está computando precisa do lock no finally para cleanup.
-
-        # Se há computação pendente, aguarda FORA do lock (evita deadlock)
-        if pending_future is not None:
-            return await pending_future
-
-        # Aqui future nunca é None (garantido pelo fluxo acima)
-        # Mas precisamos verificar para satisfazer o type checker
-        if future is None:
-            raise RuntimeError("future não pode ser None neste ponto")  # pragma: no cover
-
-        try:
-            # Executa a computação
+        task = self._pending.get(key)
+        if task is None:
             logger.debug(f"Iniciando computação para: {key}")
-            result = await compute_func()
+            task = asyncio.get_running_loop().create_task(compute_func())
+            self._pending[key] = task
+            task.add_done_callback(partial(self._discard, key))
+        else:
+            logger.debug(f"Aguardando computação existente para: {key}")
 
-            # Completa a future com sucesso (se não foi cancelada)
-            if not future.done():
-                future.set_result(result)
-            return result
+        return await asyncio.shield(task)
+
+    def _discard(self, key: str, task: asyncio.Task[Any]) -> None:
+        """Remove a Task concluída do registro de pendentes.
+
+        Só remove se ainda for a Task registrada, já que clear() pode ter
+        liberado a chave para uma nova computação. Consome a exceção da Task
+        para que não seja reportada como nunca recuperada quando todos os
+        chamadores foram cancelados.
+        """
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()
 
+    def deduplicate_sync(self, key: str, compute_func: Callable[[], T]) -> T:
+        """Executa computação síncrona com deduplicação entre threads.
+
+        Se outra thread já está computando a mesma chave, bloqueia até
+        ela terminar e retorna o mesmo resultado (ou a mesma exceção). Se a
+        thread dona for interrompida sem resultado (ex.: ``KeyboardInterrupt``),
+        os waiters recomputam em vez de receber ``None``.
+        Chamadas reentrantes da própria thread computam diretamente.
+
+        Args:
+            key: Chave de deduplicação (normalmente a cache key)
+            compute_func: Função que computa o valor
+
+        Returns:
+            Resultado da computação
+
+        Raises:
+            Exception: Propaga exceções da computação para todos os waiters
+        """
+        with self._sync_lock:
+            call = self._pending_sync.get(key)
+            is_owner = call is None
+            if call is None:
+                call = _SyncCall()
+                self._pending_sync[key] = call
+
+        if not is_owner:
+            if call.owner == threading.get_ident():
+                return compute_func()
+            logger.debug(f"Aguardando computação existente para: {key}")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            if call.result is _NO_RESULT:
+                # Dono interrompido por BaseException (ex.: KeyboardInterrupt): recomputa
+                return self.deduplicate_sync(key, compute_func)
+            return call.result
+
+        try:
+            call.result = compute_func()
+            return call.result
         except Exception as e:
-            # Propaga a exceção para todos os waiters (se não foi cancelada)
-            if not future.done():
-                future.set_exception(e)
+            call.error = e
             raise
-
         finally:
-            # Remove da lista de pendentes
-            async with self._get_lock():
-                self._pending.pop(key, None)
+            with self._sync_lock:
+                if self._pending_sync.get(key) is call:
+                    del self._pending_sync[key]
+            call.event.set()
 
     async def is_pending(self, key: str) -> bool:
         """Verifica se há computação pendente para a chave."""
-        async with self._get_lock():
-            return key in self._pending
+        return key in self._pending
 
     async def pending_count(self) -> int:
         """Retorna número de computações pendentes."""
-        async with self._get_lock():
-            return len(self._pending)
+        return len(self._pending)
 
     async def clear(self) -> int:
         """Limpa computações pendentes (cancela todas).
@@ -136,10 +173,8 @@ class DeduplicationManager:
         Returns:
             Número de computações canceladas
         """
-        async with self._get_lock():
-            count = len(self._pending)
-            for future in self._pending.values():
-                if not future.done():
-                    future.cancel()
-            self._pending.clear()
-            return count
+        count = len(self._pending)
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+        return count
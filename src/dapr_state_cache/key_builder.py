@@ -3,18 +3,35 @@
 import hashlib
 import inspect
 import json
-from collections.abc import Callable
+import weakref
+from collections.abc import Callable, Iterable
 from typing import Any
 
+# Tipos que _normalize devolve inalterados; checagem por tipo exato
+_SCALAR_TYPES = frozenset({type(None), bool, int, float, str})
+
+# Encoder pré-configurado: json.dumps com opções não padrão cria um
+# JSONEncoder novo a cada chamada. Saída idêntica à de json.dumps.
+_KEY_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    default=str,  # Fallback para tipos não serializáveis
+)
+
+
+def _identity(obj: Any) -> Any:
+    """Devolve o objeto inalterado (escalares já serializáveis em JSON)."""
+    return obj
+
 
 class DefaultKeyBuilder:
-    """Construtor de chaves padrão usando SHA256.
+    """Construtor de chaves padrão usando BLAKE2b.
 
     Gera chaves determinísticas no formato:
     {prefix}:{module}.{qualname}:{hash_args}
 
-    O hash é calculado sobre os argumentos serializados,
-    excluindo 'self' e 'cls' para métodos.
+    O hash (BLAKE2b com digest de 8 bytes, 16 caracteres hex) é calculado
+    sobre os argumentos serializados, excluindo 'self' e 'cls' para métodos.
+    É determinístico entre processos, ao contrário de ``hash()``.
 
     Attributes:
         prefix: Prefixo para todas as chaves geradas
@@ -32,6 +49,22 @@ class DefaultKeyBuilder:
         if not prefix:
             raise ValueError("Prefix não pode ser vazio")
         self._prefix = prefix
+        # (caminho, é método) por id(func); a entrada sai junto com a função (weakref.finalize)
+        self._function_info: dict[int, tuple[str, bool]] = {}
+
+        # Despacho de _normalize por tipo exato: um lookup em dict em vez da
+        # cadeia de isinstance; subclasses caem na cadeia como antes
+        self._normalizers: dict[type, Callable[[Any], Any]] = dict.fromkeys(_SCALAR_TYPES, _identity)
+        self._normalizers.update(
+            {
+                bytes: self._normalize_bytes,
+                list: self._normalize_sequence,
+                tuple: self._normalize_sequence,
+                dict: self._normalize_mapping,
+                set: self._normalize_set,
+                frozenset: self._normalize_set,
+            }
+        )
 
     @property
     def prefix(self) -> str:
@@ -49,69 +82,105 @@ class DefaultKeyBuilder:
         Returns:
             Chave no formato prefix:path:hash
         """
-        func_path = self._get_function_path(func)
-        filtered_args = self._filter_method_args(func, args)
-        args_hash = self._hash_arguments(filtered_args, kwargs)
+        func_path, is_method = self._get_function_info(func)
+        # Remove 'self' ou 'cls' de métodos; funções comuns usam args sem cópia.
+        # Isso permite que cache seja compartilhado entre instâncias
+        # da mesma classe quando chamado com os mesmos argumentos.
+        if is_method and args:
+            args = args[1:]
+        args_hash = self._hash_arguments(args, kwargs)
         return f"{self._prefix}:{func_path}:{args_hash}"
 
+    def _get_function_info(self, func: Callable[..., Any]) -> tuple[str, bool]:
+        """Obtém caminho completo da função e se é método (memoizado por função)."""
+        func_id = id(func)
+        info = self._function_info.get(func_id)
+        if info is None:
+            info = (self._get_function_path(func), self._is_method(func))
+            try:
+                weakref.finalize(func, self._function_info.pop, func_id, None)
+            except TypeError:
+                # Sem suporte a weakref o id poderia ser reutilizado: não memoiza
+                return info
+            self._function_info[func_id] = info
+        return info
+
     def _get_function_path(self, func: Callable[..., Any]) -> str:
         """Obtém caminho completo da função."""
         module = getattr(func, "__module__", "unknown")
         qualname = getattr(func, "__qualname__", func.__name__)
         return f"{module}.{qualname}"
 
-    def _filter_method_args(self, func: Callable[..., Any], args: tuple[Any, ...]) -> tuple[Any, ...]:
-        """Remove 'self' ou 'cls' dos argumentos de métodos.
-
-        Isso permite que cache seja compartilhado entre instâncias
-        da mesma classe quando chamado com os mesmos argumentos.
-        """
-        if not args:
-            return args
-
+    def _is_method(self, func: Callable[..., Any]) -> bool:
+        """Indica se o primeiro parâmetro é 'self' ou 'cls' (via inspect.signature)."""
         try:
-            sig = inspect.signature(func)
-            params = list(sig.parameters.keys())
-            if params and params[0] in ("self", "cls"):
-                return args[1:]
+            params = iter(inspect.signature(func).parameters)
+            return next(params, None) in ("self", "cls")
         except (ValueError, TypeError):
-            pass
-
-        return args
+            return False
 
     def _hash_arguments(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
-        """Calcula hash SHA256 dos argumentos."""
-        # Ordena kwargs para determinismo
-        sorted_kwargs = dict(sorted(kwargs.items()))
-
-        # Serializa para JSON (tipos básicos)
+        """Calcula hash BLAKE2b (8 bytes) dos argumentos."""
+        # Serializa para JSON (tipos básicos); o encoder já ordena as chaves
+        # (sort_keys), então kwargs não precisa ser ordenado antes
         try:
-            serialized = json.dumps(
-                {"args": self._normalize(args), "kwargs": self._normalize(sorted_kwargs)},
-                sort_keys=True,
-                default=str,  # Fallback para tipos não serializáveis
-            )
+            # Argumentos só com escalares (caso comum) dispensam a normalização recursiva
+            if all(type(arg) in _SCALAR_TYPES for arg in args) and all(
+                type(value) in _SCALAR_TYPES for value in kwargs.values()
+            ):
+                payload = {"args": args, "kwargs": kwargs}
+            else:
+                payload = {"args": self._normalize(args), "kwargs": self._normalize(kwargs)}
+            serialized = _KEY_ENCODER.encode(payload)
         except (TypeError, ValueError):
-            # Fallback: usa representação string
-            serialized = f"{args!r}:{sorted_kwargs!r}"
+            # Fallback: usa representação string, com kwargs ordenados para determinismo
+            serialized = f"{args!r}:{dict(sorted(kwargs.items()))!r}"
 
         # Calcula hash
-        return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+        # BLAKE2b com digest de 8 bytes: mesmo tamanho de chave (16 hex) e
+        # mais rápido que SHA256 truncado para entradas pequenas
+        return hashlib.blake2b(serialized.encode(), digest_size=8).hexdigest()
 
     def _normalize(self, obj: Any) -> Any:
         """Normaliza objeto para serialização JSON."""
+        normalizer = self._normalizers.get(type(obj))
+        if normalizer is _identity:
+            # Escalares: devolve direto, sem a chamada ao handler
+            return obj
+        if normalizer is not None:
+            return normalizer(obj)
         if obj is None or isinstance(obj, (bool, int, float, str)):
             return obj
         if isinstance(obj, bytes):
-            return obj.decode("utf-8", errors="replace")
+            return self._normalize_bytes(obj)
         if isinstance(obj, (list, tuple)):
-            return [self._normalize(item) for item in obj]
+            return self._normalize_sequence(obj)
         if isinstance(obj, dict):
-            return {str(k): self._normalize(v) for k, v in obj.items()}
+            return self._normalize_mapping(obj)
         if isinstance(obj, (set, frozenset)):
-            # Converte para string antes de ordenar para evitar TypeError
-            # quando o set contém tipos mistos (ex: {1, "string", 3.14})
-            normalized_items = [self._normalize(item) for item in obj]
-            return sorted(normalized_items, key=lambda x: (type(x).__name__, str(x)))
+            return self._normalize_set(obj)
         # Para outros tipos, usa representação string
         return str(obj)
+
+    def _normalize_bytes(self, obj: bytes) -> str:
+        """Normaliza bytes como texto UTF-8 (bytes inválidos são substituídos)."""
+        return obj.decode("utf-8", errors="replace")
+
+    def _normalize_sequence(self, obj: list[Any] | tuple[Any, ...]) -> list[Any]:
+        """Normaliza listas e tuplas item a item."""
+        return [self._normalize(item) for item in obj]
+
+    def _normalize_mapping(self, obj: dict[Any, Any]) -> dict[str, Any]:
+        """Normaliza dicts com chaves convertidas para string."""
+        return {str(k): self._normalize(v) for k, v in obj.items()}
+
+    def _normalize_set(self, obj: set[Any] | frozenset[Any]) -> list[Any]:
+        """Normaliza sets como lista ordenada de forma determinística."""
+        # Sets só com escalares (caso comum) já estão normalizados: dispensa a recursão
+        if all(type(item) in _SCALAR_TYPES for item in obj):
+            normalized_items: Iterable[Any] = obj
+        else:
+            normalized_items = [self._normalize(item) for item in obj]
+        # Converte para string antes de ordenar para evitar TypeError
+        # quando o set contém tipos mistos (ex: {1, "string", 3.14})
+        return sorted(normalized_items, key=lambda x: (type(x).__name__, str(x)))
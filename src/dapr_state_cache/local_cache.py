@@ -0,0 +1,74 @@
+"""Cache local (L1) em memória na frente do Dapr State Store."""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LocalCache:
+    """Cache LRU em processo, limitado por tamanho e com TTL por entrada.
+
+    Armazena os valores já serializados (bytes), de modo que cada hit
+    deserializa uma cópia nova e chamadores não compartilham objetos
+    mutáveis. Evita a ida ao sidecar Dapr para chaves quentes.
+
+    Thread-safe.
+
+    Attributes:
+        max_size: Número máximo de entradas mantidas
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Inicializa o cache local.
+
+        Args:
+            max_size: Número máximo de entradas (LRU)
+
+        Raises:
+            ValueError: Se max_size não for positivo
+        """
+        if max_size <= 0:
+            raise ValueError("max_size deve ser positivo")
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Número máximo de entradas."""
+        return self._max_size
+
+    def get(self, key: str) -> bytes | None:
+        """Busca valor não expirado, marcando-o como usado recentemente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Armazena valor, removendo o menos usado se exceder max_size."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove entrada, se existir."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -34,6 +34,8 @@ class CacheMetrics(Protocol):
 class NoOpMetrics:
     """Coletor de métricas que não faz nada (default)."""
 
+    __slots__ = ()
+
     def record_hit(self, key: str, latency: float) -> None:
         pass
 
@@ -47,7 +49,7 @@ class NoOpMetrics:
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyStats:
     """Estatísticas para uma chave específica."""
 
@@ -77,7 +79,7 @@ class KeyStats:
         return (self.total_latency_misses / self.misses * 1000) if self.misses > 0 else 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheStats:
     """Estatísticas agregadas do cache."""
 
@@ -145,6 +147,15 @@ class OpenTelemetryMetrics:
         ```
     """
 
+    __slots__ = (
+        "_errors_counter",
+        "_hits_counter",
+        "_latency_histogram",
+        "_misses_counter",
+        "_size_histogram",
+        "_writes_counter",
+    )
+
     def __init__(self, meter_name: str = "dapr_state_cache") -> None:
         """Inicializa métricas OpenTelemetry.
 
@@ -217,6 +228,8 @@ class InMemoryMetrics:
         max_samples: Máximo de amostras de latência mantidas
     """
 
+    __slots__ = ("_by_key", "_lock", "_max_samples", "_overall")
+
     def __init__(self, max_samples: int = 1000) -> None:
         """Inicializa coletor de métricas.
 
@@ -235,8 +248,9 @@ class InMemoryMetrics:
             self._overall.hit_latencies.append(latency)
             self._trim_samples(self._overall.hit_latencies)
 
-            self._by_key[key].hits += 1
-            self._by_key[key].total_latency_hits += latency
+            key_stats = self._by_key[key]
+            key_stats.hits += 1
+            key_stats.total_latency_hits += latency
 
     def record_miss(self, key: str, latency: float) -> None:
         """Registra cache miss."""
@@ -245,8 +259,9 @@ class InMemoryMetrics:
             self._overall.miss_latencies.append(latency)
             self._trim_samples(self._overall.miss_latencies)
 
-            self._by_key[key].misses += 1
-            self._by_key[key].total_latency_misses += latency
+            key_stats = self._by_key[key]
+            key_stats.misses += 1
+            key_stats.total_latency_misses += latency
 
     def record_write(self, key: str, size: int) -> None:
         """Registra escrita no cache."""
@@ -255,8 +270,9 @@ class InMemoryMetrics:
             self._overall.write_sizes.append(size)
             self._trim_samples(self._overall.write_sizes)
 
-            self._by_key[key].writes += 1
-            self._by_key[key].total_bytes_written += size
+            key_stats = self._by_key[key]
+            key_stats.writes += 1
+            key_stats.total_bytes_written += size
 
     def record_error(self, key: str, error: Exception) -> None:
         """Registra erro de cache."""
@@ -7,7 +7,7 @@ Define interfaces que permitem implementações customizadas de:
 """
 
 from collections.abc import Callable
-from typing import Any, Protocol
+from typing import Any, Protocol, runtime_checkable
 
 
 class KeyBuilder(Protocol):
@@ -43,6 +43,7 @@ class KeyBuilder(Protocol):
         ...
 
 
+@runtime_checkable
 class Serializer(Protocol):
     """Protocol para serialização de dados.
 
@@ -1,22 +1,36 @@
-"""Serialização de dados para cache usando MsgPack."""
+"""Serialização de dados para cache usando MsgPack.
 
-from typing import Any, Protocol
+As bibliotecas de codec (msgpack, msgspec) são importadas apenas quando o
+primeiro serializer correspondente é criado, para que importar o pacote
+não pague o custo de codecs que a aplicação não usa.
+"""
 
-import msgpack
+from functools import cache
+from typing import Any
 
 from .exceptions import CacheSerializationError
+from .protocols import Serializer
 
+__all__ = ["MsgPackSerializer", "MsgspecSerializer", "Serializer"]
 
-class Serializer(Protocol):
-    """Protocol para serializers customizados."""
 
-    def serialize(self, data: Any) -> bytes:
-        """Serializa dados Python para bytes."""
-        ...
+@cache
+def _msgspec_codec() -> tuple[Any, Any, tuple[type[Exception], ...]]:
+    """Importa msgspec e cria Encoder/Decoder compartilhados (thread-safe).
 
-    def deserialize(self, data: bytes) -> Any:
-        """Deserializa bytes para dados Python."""
-        ...
+    Returns:
+        Tupla (encode, decode, exceções de encode)
+
+    Raises:
+        ImportError: Se msgspec não estiver instalado
+    """
+    try:
+        import msgspec
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("msgspec não está instalado: pip install dapr-state-cache[msgspec]") from e
+
+    encode_errors = (msgspec.EncodeError, TypeError, ValueError, OverflowError)
+    return msgspec.msgpack.Encoder().encode, msgspec.msgpack.Decoder().decode, encode_errors
 
 
 class MsgPackSerializer:
@@ -31,6 +45,13 @@ class MsgPackSerializer:
     - datetime (via timestamp extension)
     """
 
+    def __init__(self) -> None:
+        import msgpack
+
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+        self._unpack_errors = (msgpack.UnpackException, ValueError)
+
     def serialize(self, data: Any) -> bytes:
         """Serializa dados Python para bytes MsgPack.
 
@@ -44,7 +65,7 @@ class MsgPackSerializer:
             CacheSerializationError: Se falhar ao serializar
         """
         try:
-            result = msgpack.packb(data, use_bin_type=True)
+            result = self._packb(data, use_bin_type=True)
             if result is None:
                 raise CacheSerializationError("msgpack.packb retornou None")
             return result
@@ -64,6 +85,61 @@ class MsgPackSerializer:
             CacheSerializationError: Se falhar ao deserializar
         """
         try:
-            return msgpack.unpackb(data, raw=False)
-        except (msgpack.UnpackException, ValueError) as e:
+            return self._unpackb(data, raw=False)
+        except self._unpack_errors as e:
+            raise CacheSerializationError(f"Falha ao deserializar dados: {e}") from e
+
+
+class MsgspecSerializer:
+    """Serializer MessagePack usando msgspec (extra opcional ``msgspec``).
+
+    Opt-in via ``@cacheable(serializer=MsgspecSerializer())``. O Encoder e o
+    Decoder do msgspec são criados uma única vez e compartilhados por todas
+    as instâncias, evitando alocação de estado a cada chamada.
+
+    Atenção: o msgspec codifica tipos que o MsgPackSerializer rejeita
+    (dataclass, set, UUID, Enum, datetime), mas sem informação de tipo, então
+    um cache hit devolve dict, list ou str no lugar do objeto original. As
+    entradas também não são intercambiáveis com as do MsgPackSerializer em
+    todos os casos (ex.: dicts com chaves não-string).
+
+    Raises:
+        ImportError: Se msgspec não estiver instalado
+    """
+
+    def __init__(self) -> None:
+        self._encode, self._decode, self._encode_errors = _msgspec_codec()
+
+    def serialize(self, data: Any) -> bytes:
+        """Serializa dados Python para bytes MsgPack.
+
+        Args:
+            data: Dados a serializar
+
+        Returns:
+            Dados serializados em bytes
+
+        Raises:
+            CacheSerializationError: Se falhar ao serializar
+        """
+        try:
+            return self._encode(data)
+        except self._encode_errors as e:
+            raise CacheSerializationError(f"Falha ao serializar dados: {e}") from e
+
+    def deserialize(self, data: bytes) -> Any:
+        """Deserializa bytes MsgPack para dados Python.
+
+        Args:
+            data: Bytes MsgPack
+
+        Returns:
+            Dados Python deserializados
+
+        Raises:
+            CacheSerializationError: Se falhar ao deserializar
+        """
+        try:
+            return self._decode(data)
+        except ValueError as e:  # msgspec.DecodeError é subclasse de ValueError
             raise CacheSerializationError(f"Falha ao deserializar dados: {e}") from e
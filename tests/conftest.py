@@ -1,7 +1,12 @@
 """Configuração de fixtures para testes."""
 
+import threading
+
 import pytest
 
+from dapr_state_cache import deduplication
+from tests.helpers import FakeClock
+
 
 @pytest.fixture
 def sample_data() -> dict:
@@ -13,3 +18,36 @@ def sample_data() -> dict:
 def sample_bytes() -> bytes:
     """Bytes de exemplo para testes."""
     return b"test data bytes"
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Substitui o relógio usado pelo decorator para medir latência."""
+    clock = FakeClock()
+    monkeypatch.setattr("dapr_state_cache.decorator._clock", clock)
+    return clock
+
+
+@pytest.fixture
+def sync_waiters(monkeypatch: pytest.MonkeyPatch) -> threading.Semaphore:
+    """Semáforo liberado sempre que uma thread passa a aguardar uma computação sync em andamento.
+
+    Permite que o teste segure a computação dona até os waiters estarem
+    registrados, sem depender de sleeps.
+    """
+    waiting = threading.Semaphore(0)
+
+    class _ObservedEvent(threading.Event):
+        def wait(self, timeout: float | None = None) -> bool:
+            waiting.release()
+            return super().wait(timeout)
+
+    class _ObservedSyncCall(deduplication._SyncCall):
+        __slots__ = ()
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.event = _ObservedEvent()
+
+    monkeypatch.setattr(deduplication, "_SyncCall", _ObservedSyncCall)
+    return waiting
@@ -0,0 +1,20 @@
+"""Utilitários compartilhados pelos testes."""
+
+from collections import namedtuple
+
+# Resposta HTTP mínima (status_code + content) usada no lugar de MagicMock
+StateResponse = namedtuple("StateResponse", ["status_code", "content"], defaults=[b""])
+
+
+class FakeClock:
+    """Relógio determinístico que só avança quando o teste pede."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Avança o relógio sem dormir."""
+        self.now += seconds
@@ -1,475 +1,663 @@
 """Testes para o backend Dapr State."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import inspect
+import json
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
 
-from dapr_state_cache.backend import DaprStateBackend, _get_dapr_url
+from dapr_state_cache.backend import (
+    DaprStateBackend,
+    WriteBatcher,
+    _dumps_json,
+    _get_dapr_url,
+    _stdlib_dumps_json,
+)
 from dapr_state_cache.exceptions import CacheConnectionError, CacheKeyError
+from tests.helpers import StateResponse
+
+# URL fictícia do sidecar usada pelos testes HTTP
+_DAPR_URL = "http://test:3500"
+
+
+class _FakeAsyncClient:
+    """Substituto leve de httpx.AsyncClient: responde ou falha sempre do mesmo jeito."""
+
+    def __init__(self, response: StateResponse | None = None, error: Exception | None = None) -> None:
+        self.calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+        self._response = response
+        self._error = error
+
+    async def _request(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> StateResponse | None:
+        self.calls.append((method, args, kwargs))
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+    async def get(self, *args: Any, **kwargs: Any) -> StateResponse | None:
+        return await self._request("get", args, kwargs)
+
+    async def post(self, *args: Any, **kwargs: Any) -> StateResponse | None:
+        return await self._request("post", args, kwargs)
+
+    async def delete(self, *args: Any, **kwargs: Any) -> StateResponse | None:
+        return await self._request("delete", args, kwargs)
+
+    async def aclose(self) -> None:
+        self.calls.append(("aclose", (), {}))
+
+
+@pytest.fixture
+def http_client() -> MagicMock:
+    """Cliente sync falso, injetado direto na instância (sem patch na classe)."""
+    return MagicMock(spec=httpx.Client)
+
+
+@pytest.fixture(scope="module")
+def readonly_backend() -> DaprStateBackend:
+    """Backend compartilhado pelos testes de lógica pura (nunca cria clientes)."""
+    return DaprStateBackend("store")
+
+
+@pytest.fixture
+def async_backend() -> DaprStateBackend:
+    """Backend sem cliente async; cada teste injeta o seu _FakeAsyncClient."""
+    return DaprStateBackend("store", dapr_url=_DAPR_URL)
+
+
+@pytest.fixture
+def sync_backend(http_client: MagicMock) -> DaprStateBackend:
+    """Backend com o cliente sync falso."""
+    backend = DaprStateBackend("store", dapr_url=_DAPR_URL)
+    backend._sync_client = http_client
+    return backend
 
 
 class TestGetDaprUrl:
     """Testes para _get_dapr_url."""
 
-    def test_default_url(self) -> None:
+    def test_default_url(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Deve retornar URL padrão."""
-        with patch.dict("os.environ", {}, clear=True):
-            url = _get_dapr_url()
-            assert url == "http://127.0.0.1:3500"
+        monkeypatch.delenv("DAPR_HTTP_HOST", raising=False)
+        monkeypatch.delenv("DAPR_HTTP_PORT", raising=False)
+
+        assert _get_dapr_url() == "http://127.0.0.1:3500"
 
-    def test_custom_host_and_port(self) -> None:
+    def test_custom_host_and_port(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Deve usar variáveis de ambiente."""
-        with patch.dict("os.environ", {"DAPR_HTTP_HOST": "custom", "DAPR_HTTP_PORT": "3501"}):
-            url = _get_dapr_url()
-            assert url == "http://custom:3501"
+        monkeypatch.setenv("DAPR_HTTP_HOST", "custom")
+        monkeypatch.setenv("DAPR_HTTP_PORT", "3501")
+
+        assert _get_dapr_url() == "http://custom:3501"
+
+
+class TestDumpsJson:
+    """Testes para _dumps_json."""
+
+    def test_matches_httpx_json_body(self) -> None:
+        """Deve gerar o mesmo corpo compacto que httpx gera com json=."""
+        payload = [{"key": "chave-é", "value": "aGVsbG8=", "metadata": {"ttlInSeconds": "60"}}]
+
+        expected = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        assert _dumps_json(payload) == expected
+
+    def test_bytes_encoded_as_base64(self) -> None:
+        """Bytes devem ser codificados como string base64."""
+        assert _dumps_json({"value": b"hello"}) == b'{"value":"aGVsbG8="}'
+
+    def test_stdlib_fallback_matches_msgspec(self) -> None:
+        """Fallback da stdlib deve gerar o mesmo corpo que o msgspec."""
+        payload = [{"key": "chave-é", "value": b"\x00\xffbinary", "metadata": {"ttlInSeconds": "60"}}]
+
+        assert _stdlib_dumps_json(payload) == _dumps_json(payload)
+
+    def test_stdlib_fallback_rejects_unknown_types(self) -> None:
+        """Fallback da stdlib deve rejeitar tipos não serializáveis."""
+        with pytest.raises(TypeError):
+            _stdlib_dumps_json({"value": object()})
 
 
 class TestDaprStateBackend:
     """Testes para DaprStateBackend."""
 
-    def test_init_with_store_name(self) -> None:
-        """Deve inicializar com nome do store."""
-        backend = DaprStateBackend("my-store")
-        assert backend.store_name == "my-store"
+    @pytest.mark.parametrize(
+        ("kwargs", "attribute", "expected"),
+        [
+            ({}, "store_name", "my-store"),
+            ({"timeout": 10.0}, "_timeout", 10.0),
+            ({"dapr_url": "http://custom:3501"}, "_base_url", "http://custom:3501"),
+        ],
+    )
+    def test_init(self, kwargs: dict[str, Any], attribute: str, expected: object) -> None:
+        """Deve guardar nome do store, timeout e URL do sidecar."""
+        backend = DaprStateBackend("my-store", **kwargs)
+        assert getattr(backend, attribute) == expected
 
     def test_init_empty_store_name_raises_error(self) -> None:
         """Deve lançar erro com store_name vazio."""
         with pytest.raises(CacheKeyError):
             DaprStateBackend("")
 
-    def test_init_with_custom_timeout(self) -> None:
-        """Deve aceitar timeout customizado."""
-        backend = DaprStateBackend("store", timeout=10.0)
-        assert backend._timeout == 10.0
-
-    def test_init_with_custom_url(self) -> None:
-        """Deve aceitar URL customizada."""
-        backend = DaprStateBackend("store", dapr_url="http://custom:3501")
-        assert backend._base_url == "http://custom:3501"
-
-    def test_state_url_without_key(self) -> None:
+    def test_state_url_without_key(self, readonly_backend: DaprStateBackend) -> None:
         """Deve construir URL sem chave."""
-        backend = DaprStateBackend("mystore")
-        url = backend._state_url()
-        assert url == "/v1.0/state/mystore"
+        url = readonly_backend._state_url()
+        assert url == "/v1.0/state/store"
 
-    def test_state_url_with_key(self) -> None:
+    def test_state_url_with_key(self, readonly_backend: DaprStateBackend) -> None:
         """Deve construir URL com chave."""
-        backend = DaprStateBackend("mystore")
-        url = backend._state_url("mykey")
-        assert url == "/v1.0/state/mystore/mykey"
-
-    def test_encode_value(self) -> None:
-        """Deve codificar valor em base64."""
+        url = readonly_backend._state_url("mykey")
+        assert url == "/v1.0/state/store/mykey"
+
+    def test_state_item_value_encoded_as_base64(self, readonly_backend: DaprStateBackend) -> None:
+        """Valor do item de escrita deve ir em base64 no corpo JSON."""
+        body = _dumps_json(readonly_backend._state_item("key", b"hello", 60))
+        assert json.loads(body)["value"] == "aGVsbG8="
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (b"hello", b"hello"),  # Bytes passam direto
+            ("aGVsbG8=", b"hello"),  # String base64
+            ("not-base64!", b"not-base64!"),  # Base64 inválido vira UTF-8
+            (None, None),
+            (12345, None),  # Tipo não suportado
+        ],
+    )
+    def test_decode_value(self, value: object, expected: bytes | None, readonly_backend: DaprStateBackend) -> None:
+        """Deve decodificar valores do state store."""
+        assert readonly_backend._decode_value(value) == expected
+
+    @pytest.mark.asyncio(loop_scope="session")
+    @pytest.mark.parametrize(
+        ("method", "args"),
+        [
+            ("get", ("",)),
+            ("set", ("", b"value", 3600)),
+            ("set_many", ([("k1", b"v1", 60), ("", b"v2", 60)],)),
+            ("get_async", ("",)),
+            ("set_async", ("", b"value", 3600)),
+            ("set_many_async", ([("", b"v1", 60)],)),
+        ],
+    )
+    async def test_empty_key_raises_error(self, method: str, args: tuple[Any, ...]) -> None:
+        """Deve lançar erro para chave vazia, antes de qualquer requisição."""
         backend = DaprStateBackend("store")
-        encoded = backend._encode_value(b"hello")
-        assert encoded == "aGVsbG8="
 
-    def test_decode_value_from_bytes(self) -> None:
-        """Deve decodificar bytes diretamente."""
-        backend = DaprStateBackend("store")
-        result = backend._decode_value(b"hello")
-        assert result == b"hello"
+        with pytest.raises(CacheKeyError):
+            result = getattr(backend, method)(*args)
+            if inspect.isawaitable(result):
+                await result
 
-    def test_decode_value_from_base64_string(self) -> None:
-        """Deve decodificar string base64."""
-        backend = DaprStateBackend("store")
-        result = backend._decode_value("aGVsbG8=")
-        assert result == b"hello"
+        assert backend._sync_client is None
+        assert backend._async_client is None
 
-    def test_decode_value_none(self) -> None:
-        """Deve retornar None para valor None."""
+    @pytest.mark.asyncio(loop_scope="session")
+    @pytest.mark.parametrize(
+        ("method", "args", "expected"),
+        [
+            ("delete", ("",), False),
+            ("set_many", ([],), True),
+            ("delete_many", ([],), True),
+            ("delete_async", ("",), False),
+            ("set_many_async", ([],), True),
+            ("delete_many_async", ([],), True),
+        ],
+    )
+    async def test_empty_input_is_noop(self, method: str, args: tuple[Any, ...], expected: bool) -> None:
+        """Entrada vazia deve retornar sem criar cliente nem fazer requisição."""
         backend = DaprStateBackend("store")
-        result = backend._decode_value(None)
-        assert result is None
 
-    def test_get_empty_key_raises_error(self) -> None:
-        """Deve lançar erro para chave vazia no get."""
-        backend = DaprStateBackend("store")
-        with pytest.raises(CacheKeyError):
-            backend.get("")
+        result = getattr(backend, method)(*args)
+        if inspect.isawaitable(result):
+            result = await result
 
-    def test_set_empty_key_raises_error(self) -> None:
-        """Deve lançar erro para chave vazia no set."""
-        backend = DaprStateBackend("store")
-        with pytest.raises(CacheKeyError):
-            backend.set("", b"value", 3600)
-
-    def test_delete_empty_key_returns_false(self) -> None:
-        """Deve retornar False para chave vazia no delete."""
-        backend = DaprStateBackend("store")
-        result = backend.delete("")
-        assert result is False
+        assert result is expected
+        assert backend._sync_client is None
+        assert backend._async_client is None
 
     def test_context_manager_sync(self) -> None:
         """Deve funcionar como context manager síncrono."""
         with DaprStateBackend("store") as backend:
             assert backend.store_name == "store"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_context_manager_async(self) -> None:
         """Deve funcionar como context manager assíncrono."""
         async with DaprStateBackend("store") as backend:
             assert backend.store_name == "store"
 
-    @pytest.mark.asyncio
-    async def test_get_async_empty_key_raises_error(self) -> None:
-        """Deve lançar erro para chave vazia no get_async."""
-        backend = DaprStateBackend("store")
-        with pytest.raises(CacheKeyError):
-            await backend.get_async("")
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            (b"aGVsbG8=", b"hello"),  # Base64 sem aspas
+            (b'"aGVsbG8="', b"hello"),  # Base64 com aspas JSON
+            (b"abc", b"abc"),  # Base64 inválido retorna o corpo
+            ("olá".encode(), "olá".encode()),  # UTF-8 não-ASCII
+        ],
+    )
+    def test_decode_response(self, content: bytes, expected: bytes, readonly_backend: DaprStateBackend) -> None:
+        """Deve decodificar o corpo da resposta direto dos bytes."""
+        assert readonly_backend._decode_response(content) == expected
 
-    @pytest.mark.asyncio
-    async def test_set_async_empty_key_raises_error(self) -> None:
-        """Deve lançar erro para chave vazia no set_async."""
-        backend = DaprStateBackend("store")
-        with pytest.raises(CacheKeyError):
-            await backend.set_async("", b"value", 3600)
 
-    @pytest.mark.asyncio
-    async def test_delete_async_empty_key_returns_false(self) -> None:
-        """Deve retornar False para chave vazia no delete_async."""
-        backend = DaprStateBackend("store")
-        result = await backend.delete_async("")
-        assert result is False
+class TestDaprStateBackendHttpSync:
+    """Testes para operações HTTP síncronas."""
 
-    def test_decode_value_invalid_base64_returns_utf8(self) -> None:
-        """Deve retornar string como UTF-8 se não for base64 válido."""
-        backend = DaprStateBackend("store")
-        result = backend._decode_value("not-base64!")
-        assert result == b"not-base64!"
+    @pytest.mark.parametrize(
+        ("response", "expected"),
+        [
+            (StateResponse(204), None),
+            (StateResponse(200), None),  # Conteúdo vazio
+            (StateResponse(200, b"aGVsbG8="), b"hello"),  # "hello" em base64
+            (StateResponse(500, b"error"), None),
+            (StateResponse(200, b"\xff\xfe"), None),  # Bytes inválidos UTF-8
+        ],
+    )
+    def test_get_response(
+        self,
+        response: StateResponse,
+        expected: bytes | None,
+        http_client: MagicMock,
+        sync_backend: DaprStateBackend,
+    ) -> None:
+        """Deve decodificar hits e tratar 204, corpo vazio, status inesperado e UTF-8 inválido como miss."""
+        http_client.get.return_value = response
+
+        assert sync_backend.get("mykey") == expected
+
+    @pytest.mark.parametrize(("status_code", "expected"), [(204, True), (500, False)])
+    def test_set_response(
+        self, status_code: int, expected: bool, http_client: MagicMock, sync_backend: DaprStateBackend
+    ) -> None:
+        """Deve retornar True para set bem sucedido e False para falha."""
+        http_client.post.return_value = StateResponse(status_code)
+
+        assert sync_backend.set("mykey", b"value", 3600) is expected
+
+    def test_get_connect_error(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve lançar CacheConnectionError em erro de conexão."""
+        http_client.get.side_effect = httpx.ConnectError("Connection refused")
 
-    def test_decode_value_non_string_non_bytes_returns_none(self) -> None:
-        """Deve retornar None para tipos não suportados."""
-        backend = DaprStateBackend("store")
-        result = backend._decode_value(12345)
-        assert result is None
+        with pytest.raises(CacheConnectionError):
+            sync_backend.get("mykey")
 
+    def test_get_timeout(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve retornar None em timeout."""
+        http_client.get.side_effect = httpx.TimeoutException("Timeout")
 
-class TestDaprStateBackendHttpSync:
-    """Testes para operações HTTP síncronas."""
+        result = sync_backend.get("mykey")
+        assert result is None
 
-    def test_get_cache_miss_204(self) -> None:
-        """Deve retornar None para status 204."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
-        mock_response.content = b""
-
-        with patch.object(httpx.Client, "get", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.get("mykey")
-            assert result is None
-
-    def test_get_cache_miss_empty_content(self) -> None:
-        """Deve retornar None para conteúdo vazio."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b""
-
-        with patch.object(httpx.Client, "get", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.get("mykey")
-            assert result is None
-
-    def test_get_cache_hit(self) -> None:
-        """Deve retornar valor decodificado para hit."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"aGVsbG8="  # "hello" em base64
-
-        with patch.object(httpx.Client, "get", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.get("mykey")
-            assert result == b"hello"
-
-    def test_get_unexpected_status(self) -> None:
-        """Deve retornar None para status inesperado."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.content = b"error"
-
-        with patch.object(httpx.Client, "get", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.get("mykey")
-            assert result is None
-
-    def test_get_connect_error(self) -> None:
+    def test_set_connect_error(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
         """Deve lançar CacheConnectionError em erro de conexão."""
-        with patch.object(httpx.Client, "get", side_effect=httpx.ConnectError("Connection refused")):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            with pytest.raises(CacheConnectionError):
-                backend.get("mykey")
+        http_client.post.side_effect = httpx.ConnectError("Connection refused")
 
-    def test_get_timeout(self) -> None:
-        """Deve retornar None em timeout."""
-        with patch.object(httpx.Client, "get", side_effect=httpx.TimeoutException("Timeout")):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.get("mykey")
-            assert result is None
-
-    def test_get_unicode_decode_error(self) -> None:
-        """Deve retornar None em erro de decodificação UTF-8."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"\xff\xfe"  # Bytes inválidos UTF-8
-
-        with patch.object(httpx.Client, "get", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.get("mykey")
-            assert result is None
-
-    def test_set_success(self) -> None:
-        """Deve retornar True para set bem sucedido."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
-
-        with patch.object(httpx.Client, "post", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.set("mykey", b"value", 3600)
-            assert result is True
-
-    def test_set_failure(self) -> None:
-        """Deve retornar False para set falho."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-
-        with patch.object(httpx.Client, "post", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.set("mykey", b"value", 3600)
-            assert result is False
-
-    def test_set_connect_error(self) -> None:
+        with pytest.raises(CacheConnectionError):
+            sync_backend.set("mykey", b"value", 3600)
+
+    def test_set_timeout(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve retornar False em timeout."""
+        http_client.post.side_effect = httpx.TimeoutException("Timeout")
+
+        result = sync_backend.set("mykey", b"value", 3600)
+        assert result is False
+
+    def test_set_many_single_request(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve enviar todas as escritas em um único POST."""
+        http_client.post.return_value = StateResponse(204)
+
+        result = sync_backend.set_many([("k1", b"v1", 60), ("k2", b"v2", 120)])
+
+        assert result is True
+        http_client.post.assert_called_once()
+        payload = json.loads(http_client.post.call_args.kwargs["content"])
+        assert [item["key"] for item in payload] == ["k1", "k2"]
+        assert payload[1]["metadata"] == {"ttlInSeconds": "120"}
+
+    def test_set_many_failure(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve retornar False para lote falho."""
+        http_client.post.return_value = StateResponse(500)
+
+        assert sync_backend.set_many([("k1", b"v1", 60)]) is False
+
+    def test_set_many_connect_error(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
         """Deve lançar CacheConnectionError em erro de conexão."""
-        with patch.object(httpx.Client, "post", side_effect=httpx.ConnectError("Connection refused")):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            with pytest.raises(CacheConnectionError):
-                backend.set("mykey", b"value", 3600)
+        http_client.post.side_effect = httpx.ConnectError("Connection refused")
 
-    def test_set_timeout(self) -> None:
+        with pytest.raises(CacheConnectionError):
+            sync_backend.set_many([("k1", b"v1", 60)])
+
+    def test_set_many_timeout(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
         """Deve retornar False em timeout."""
-        with patch.object(httpx.Client, "post", side_effect=httpx.TimeoutException("Timeout")):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.set("mykey", b"value", 3600)
-            assert result is False
+        http_client.post.side_effect = httpx.TimeoutException("Timeout")
 
-    def test_delete_success(self) -> None:
+        assert sync_backend.set_many([("k1", b"v1", 60)]) is False
+
+    def test_delete_success(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
         """Deve retornar True para delete bem sucedido."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
+        http_client.delete.return_value = StateResponse(204)
 
-        with patch.object(httpx.Client, "delete", return_value=mock_response):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.delete("mykey")
-            assert result is True
+        result = sync_backend.delete("mykey")
+        assert result is True
 
-    def test_delete_http_error(self) -> None:
+    def test_delete_http_error(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
         """Deve retornar False em erro HTTP."""
-        with patch.object(httpx.Client, "delete", side_effect=httpx.HTTPError("Error")):
-            backend = DaprStateBackend("store", dapr_url="http://test:3500")
-            backend._sync_client = httpx.Client(base_url="http://test:3500")
-            result = backend.delete("mykey")
-            assert result is False
-
-    def test_close_with_client(self) -> None:
-        """Deve fechar cliente sync."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = MagicMock()
-        backend._sync_client = mock_client
-        backend.close()
-        mock_client.close.assert_called_once()
-        assert backend._sync_client is None
+        http_client.delete.side_effect = httpx.HTTPError("Error")
+
+        result = sync_backend.delete("mykey")
+        assert result is False
+
+    def test_delete_many_single_transaction(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve remover várias chaves em uma única transação."""
+        http_client.post.return_value = StateResponse(204)
+
+        result = sync_backend.delete_many(["k1", "k2", "k1", ""])
+
+        assert result is True
+        http_client.post.assert_called_once()
+        assert http_client.post.call_args.args[0] == "/v1.0/state/store/transaction"
+        body = json.loads(http_client.post.call_args.kwargs["content"])
+        assert body == {
+            "operations": [
+                {"operation": "delete", "request": {"key": "k1"}},
+                {"operation": "delete", "request": {"key": "k2"}},
+            ]
+        }
+
+    def test_delete_many_chunks_large_keysets(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve dividir conjuntos grandes em várias transações."""
+        http_client.post.return_value = StateResponse(204)
+
+        with patch("dapr_state_cache.backend.DELETE_TRANSACTION_CHUNK_SIZE", 2):
+            assert sync_backend.delete_many(["k1", "k2", "k3"]) is True
+
+        assert http_client.post.call_count == 2
+
+    def test_delete_many_failure(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve retornar False se a transação falhar."""
+        http_client.post.return_value = StateResponse(500)
 
-    def test_close_without_client(self) -> None:
-        """Deve funcionar mesmo sem cliente."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        backend.close()  # Não deve lançar exceção
+        assert sync_backend.delete_many(["k1"]) is False
+
+    def test_delete_many_http_error(self, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve retornar False em erro HTTP."""
+        http_client.post.side_effect = httpx.HTTPError("Error")
+
+        assert sync_backend.delete_many(["k1"]) is False
+
+    @pytest.mark.parametrize("has_client", [True, False])
+    def test_close(self, has_client: bool, http_client: MagicMock, sync_backend: DaprStateBackend) -> None:
+        """Deve fechar e descartar o cliente sync, se houver."""
+        if not has_client:
+            sync_backend._sync_client = None
+
+        sync_backend.close()
+
+        assert sync_backend._sync_client is None
+        assert http_client.close.call_count == int(has_client)
 
 
 class TestDaprStateBackendHttpAsync:
     """Testes para operações HTTP assíncronas."""
 
-    @pytest.mark.asyncio
-    async def test_get_async_cache_miss_204(self) -> None:
-        """Deve retornar None para status 204."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
-        mock_response.content = b""
+    pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
+    @pytest.mark.parametrize(
+        ("response", "expected"),
+        [
+            (StateResponse(204), None),
+            (StateResponse(200, b"aGVsbG8="), b"hello"),  # "hello" em base64
+            (StateResponse(500, b"error"), None),
+            (StateResponse(200, b"\xff\xfe"), None),  # Bytes inválidos UTF-8
+        ],
+    )
+    async def test_get_async_response(
+        self, response: StateResponse, expected: bytes | None, async_backend: DaprStateBackend
+    ) -> None:
+        """Deve decodificar hits e tratar 204, status inesperado e UTF-8 inválido como miss."""
+        async_backend._async_client = _FakeAsyncClient(response=response)
 
-        result = await backend.get_async("mykey")
-        assert result is None
+        assert await async_backend.get_async("mykey") == expected
 
-    @pytest.mark.asyncio
-    async def test_get_async_cache_hit(self) -> None:
-        """Deve retornar valor decodificado para hit."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"aGVsbG8="  # "hello" em base64
-
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
-
-        result = await backend.get_async("mykey")
-        assert result == b"hello"
-
-    @pytest.mark.asyncio
-    async def test_get_async_unexpected_status(self) -> None:
-        """Deve retornar None para status inesperado."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.content = b"error"
-
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
-
-        result = await backend.get_async("mykey")
-        assert result is None
+    @pytest.mark.parametrize(("status_code", "expected"), [(204, True), (500, False)])
+    async def test_set_async_response(self, status_code: int, expected: bool, async_backend: DaprStateBackend) -> None:
+        """Deve retornar True para set bem sucedido e False para falha."""
+        async_backend._async_client = _FakeAsyncClient(response=StateResponse(status_code))
 
-    @pytest.mark.asyncio
-    async def test_get_async_connect_error(self) -> None:
-        """Deve lançar CacheConnectionError em erro de conexão."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
-        backend._async_client = mock_client
+        assert await async_backend.set_async("mykey", b"value", 3600) is expected
 
-        with pytest.raises(CacheConnectionError):
-            await backend.get_async("mykey")
+    async def test_set_many_async_single_request(self, async_backend: DaprStateBackend) -> None:
+        """Deve enviar todas as escritas em um único POST."""
+        client = _FakeAsyncClient(response=StateResponse(204))
+        async_backend._async_client = client
 
-    @pytest.mark.asyncio
-    async def test_get_async_timeout(self) -> None:
-        """Deve retornar None em timeout."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
-        backend._async_client = mock_client
+        result = await async_backend.set_many_async([("k1", b"v1", 60), ("k2", b"v2", 60)])
 
-        result = await backend.get_async("mykey")
-        assert result is None
+        assert result is True
+        [(method, _, kwargs)] = client.calls
+        assert method == "post"
+        assert len(json.loads(kwargs["content"])) == 2
 
-    @pytest.mark.asyncio
-    async def test_get_async_unicode_decode_error(self) -> None:
-        """Deve retornar None em erro de decodificação UTF-8."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"\xff\xfe"  # Bytes inválidos UTF-8
+    async def test_set_many_async_failure(self, async_backend: DaprStateBackend) -> None:
+        """Deve retornar False para lote falho."""
+        async_backend._async_client = _FakeAsyncClient(response=StateResponse(500))
 
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
+        assert await async_backend.set_many_async([("k1", b"v1", 60)]) is False
 
-        result = await backend.get_async("mykey")
-        assert result is None
+    async def test_delete_async_success(self, async_backend: DaprStateBackend) -> None:
+        """Deve retornar True para delete bem sucedido."""
+        async_backend._async_client = _FakeAsyncClient(response=StateResponse(204))
 
-    @pytest.mark.asyncio
-    async def test_set_async_success(self) -> None:
-        """Deve retornar True para set bem sucedido."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
+        result = await async_backend.delete_async("mykey")
+        assert result is True
+
+    async def test_delete_many_async_single_transaction(self, async_backend: DaprStateBackend) -> None:
+        """Deve remover várias chaves em uma única transação."""
+        client = _FakeAsyncClient(response=StateResponse(204))
+        async_backend._async_client = client
 
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
+        result = await async_backend.delete_many_async(["k1", "k2"])
 
-        result = await backend.set_async("mykey", b"value", 3600)
         assert result is True
+        [(method, args, _)] = client.calls
+        assert method == "post"
+        assert args[0] == "/v1.0/state/store/transaction"
+
+    async def test_delete_many_async_failure(self, async_backend: DaprStateBackend) -> None:
+        """Deve retornar False se a transação falhar."""
+        async_backend._async_client = _FakeAsyncClient(response=StateResponse(500))
+
+        assert await async_backend.delete_many_async(["k1"]) is False
+
+    @pytest.mark.parametrize(
+        ("method", "args", "key"),
+        [
+            ("get_async", ("mykey",), "mykey"),
+            ("set_async", ("mykey", b"value", 3600), "mykey"),
+            ("set_many_async", ([("k1", b"v1", 60)],), None),
+        ],
+    )
+    async def test_connect_error_raises(
+        self, method: str, args: tuple[Any, ...], key: str | None, async_backend: DaprStateBackend
+    ) -> None:
+        """Deve lançar CacheConnectionError com a chave afetada em erro de conexão."""
+        async_backend._async_client = _FakeAsyncClient(error=httpx.ConnectError("Connection refused"))
+
+        with pytest.raises(CacheConnectionError) as exc_info:
+            await getattr(async_backend, method)(*args)
+
+        assert type(exc_info.value) is CacheConnectionError
+        assert exc_info.value.key == key
+
+    @pytest.mark.parametrize(
+        ("method", "args", "error", "expected"),
+        [
+            ("get_async", ("mykey",), httpx.TimeoutException("Timeout"), None),
+            ("set_async", ("mykey", b"value", 3600), httpx.TimeoutException("Timeout"), False),
+            ("set_many_async", ([("k1", b"v1", 60)],), httpx.TimeoutException("Timeout"), False),
+            ("delete_async", ("mykey",), httpx.HTTPError("Error"), False),
+            ("delete_many_async", (["k1"],), httpx.HTTPError("Error"), False),
+        ],
+    )
+    async def test_http_error_returns_failure(
+        self,
+        method: str,
+        args: tuple[Any, ...],
+        error: httpx.HTTPError,
+        expected: bool | None,
+        async_backend: DaprStateBackend,
+    ) -> None:
+        """Timeouts e erros HTTP devem virar miss/falha, sem propagar."""
+        async_backend._async_client = _FakeAsyncClient(error=error)
+
+        assert await getattr(async_backend, method)(*args) is expected
+
+    @pytest.mark.parametrize("has_client", [True, False])
+    async def test_aclose(self, has_client: bool, async_backend: DaprStateBackend) -> None:
+        """Deve fechar e descartar o cliente async, se houver."""
+        client = _FakeAsyncClient()
+        if has_client:
+            async_backend._async_client = client
+
+        await async_backend.aclose()
 
-    @pytest.mark.asyncio
-    async def test_set_async_failure(self) -> None:
-        """Deve retornar False para set falho."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
+        assert async_backend._async_client is None
+        assert client.calls == ([("aclose", (), {})] if has_client else [])
+
+
+class _FakeBatchBackend:
+    """Backend mínimo para o WriteBatcher: registra cada lote recebido."""
+
+    def __init__(self, result: bool = True, error: Exception | None = None) -> None:
+        self.batches: list[list[tuple[str, bytes, int]]] = []
+        self._result = result
+        self._error = error
+
+    async def set_many_async(self, items: list[tuple[str, bytes, int]]) -> bool:
+        self.batches.append(items)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class TestWriteBatcher:
+    """Testes para WriteBatcher."""
+
+    pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+    async def test_concurrent_writes_sent_in_single_batch(self) -> None:
+        """Escritas concorrentes devem ser enviadas em um único lote."""
+        backend = _FakeBatchBackend()
+        batcher = WriteBatcher(backend)  # type: ignore[arg-type]
+
+        results = await asyncio.gather(*[batcher.set(f"key{i}", b"value", 60) for i in range(3)])
+
+        assert results == [True, True, True]
+        assert backend.batches == [[("key0", b"value", 60), ("key1", b"value", 60), ("key2", b"value", 60)]]
+
+    async def test_flushes_when_max_size_reached(self) -> None:
+        """Deve enviar o lote ao atingir o tamanho máximo."""
+        backend = _FakeBatchBackend()
+        batcher = WriteBatcher(backend, max_delay=60.0, max_size=2)  # type: ignore[arg-type]
+
+        results = await asyncio.gather(batcher.set("key1", b"v", 60), batcher.set("key2", b"v", 60))
+
+        assert results == [True, True]
+        assert backend.batches == [[("key1", b"v", 60), ("key2", b"v", 60)]]
+
+    async def test_sequential_writes_use_separate_batches(self) -> None:
+        """Escritas fora da janela devem ir em lotes separados."""
+        backend = _FakeBatchBackend()
+        batcher = WriteBatcher(backend)  # type: ignore[arg-type]
+
+        await batcher.set("key1", b"v", 60)
+        await batcher.set("key2", b"v", 60)
+
+        assert backend.batches == [[("key1", b"v", 60)], [("key2", b"v", 60)]]
+
+    async def test_error_propagated_to_all_writers(self) -> None:
+        """Erro do lote deve ser propagado para todos os chamadores."""
+        backend = _FakeBatchBackend(error=CacheConnectionError("offline"))
+        batcher = WriteBatcher(backend)  # type: ignore[arg-type]
+
+        results = await asyncio.gather(
+            batcher.set("key1", b"v", 60), batcher.set("key2", b"v", 60), return_exceptions=True
+        )
+
+        assert all(isinstance(r, CacheConnectionError) for r in results)
 
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
+    async def test_cancelled_write_is_dropped_from_batch(self) -> None:
+        """Escrita cancelada antes do envio não deve ir no lote."""
+        backend = _FakeBatchBackend()
+        batcher = WriteBatcher(backend)  # type: ignore[arg-type]
+
+        cancelled = asyncio.ensure_future(batcher.set("key1", b"v", 60))
+        kept = asyncio.ensure_future(batcher.set("key2", b"v", 60))
+        await asyncio.sleep(0)
+        cancelled.cancel()
 
-        result = await backend.set_async("mykey", b"value", 3600)
-        assert result is False
+        assert await kept is True
+        assert backend.batches == [[("key2", b"v", 60)]]
 
-    @pytest.mark.asyncio
-    async def test_set_async_connect_error(self) -> None:
-        """Deve lançar CacheConnectionError em erro de conexão."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
-        backend._async_client = mock_client
 
-        with pytest.raises(CacheConnectionError):
-            await backend.set_async("mykey", b"value", 3600)
+class TestWriteBatcherAcrossLoops:
+    """Testes para WriteBatcher compartilhado entre event loops."""
 
-    @pytest.mark.asyncio
-    async def test_set_async_timeout(self) -> None:
-        """Deve retornar False em timeout."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
-        backend._async_client = mock_client
+    def test_write_after_loop_ended_with_queued_write(self) -> None:
+        """Escrita em um novo loop não deve travar por timer de um loop encerrado."""
+        backend = _FakeBatchBackend()
+        batcher = WriteBatcher(backend, max_delay=0.01)  # type: ignore[arg-type]
 
-        result = await backend.set_async("mykey", b"value", 3600)
-        assert result is False
+        async def queue_and_exit() -> None:
+            # Tarefa pendente é cancelada pelo encerramento do asyncio.run, com a escrita na fila
+            asyncio.get_running_loop().create_task(batcher.set("key1", b"v", 60))
+            await asyncio.sleep(0)
 
-    @pytest.mark.asyncio
-    async def test_delete_async_success(self) -> None:
-        """Deve retornar True para delete bem sucedido."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
+        async def write() -> bool:
+            return await asyncio.wait_for(batcher.set("key2", b"v", 60), timeout=1.0)
 
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.delete = AsyncMock(return_value=mock_response)
-        backend._async_client = mock_client
+        asyncio.run(queue_and_exit())
 
-        result = await backend.delete_async("mykey")
-        assert result is True
+        assert asyncio.run(write()) is True
+        assert backend.batches == [[("key2", b"v", 60)]]
 
-    @pytest.mark.asyncio
-    async def test_delete_async_http_error(self) -> None:
-        """Deve retornar False em erro HTTP."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        mock_client.delete = AsyncMock(side_effect=httpx.HTTPError("Error"))
-        backend._async_client = mock_client
+    def test_concurrent_loops_in_threads_keep_their_writes(self) -> None:
+        """Escrita de um loop em outra thread não deve descartar o lote de um loop ativo."""
+        backend = _FakeBatchBackend()
+        batcher = WriteBatcher(backend, max_delay=0.01)  # type: ignore[arg-type]
+        queued = threading.Event()
+        other_done = threading.Event()
+        results: dict[str, bool] = {}
 
-        result = await backend.delete_async("mykey")
-        assert result is False
+        async def write_on_loop_a() -> bool:
+            task = asyncio.get_running_loop().create_task(batcher.set("key1", b"v", 60))
+            await asyncio.sleep(0)
+            queued.set()
+            # Bloqueia o loop A até o loop B escrever, com a escrita de A ainda na fila
+            other_done.wait(timeout=1.0)
+            return await asyncio.wait_for(task, timeout=1.0)
 
-    @pytest.mark.asyncio
-    async def test_aclose_with_client(self) -> None:
-        """Deve fechar cliente async."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        mock_client = AsyncMock()
-        backend._async_client = mock_client
-        await backend.aclose()
-        mock_client.aclose.assert_called_once()
-        assert backend._async_client is None
+        async def write_on_loop_b() -> bool:
+            return await asyncio.wait_for(batcher.set("key2", b"v", 60), timeout=1.0)
+
+        def run_a() -> None:
+            results["a"] = asyncio.run(write_on_loop_a())
+
+        def run_b() -> None:
+            queued.wait(timeout=1.0)
+            results["b"] = asyncio.run(write_on_loop_b())
+            other_done.set()
+
+        threads = [threading.Thread(target=run_a), threading.Thread(target=run_b)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
 
-    @pytest.mark.asyncio
-    async def test_aclose_without_client(self) -> None:
-        """Deve funcionar mesmo sem cliente."""
-        backend = DaprStateBackend("store", dapr_url="http://test:3500")
-        await backend.aclose()  # Não deve lançar exceção
+        assert results == {"a": True, "b": True}
+        assert sorted(backend.batches) == [[("key1", b"v", 60)], [("key2", b"v", 60)]]
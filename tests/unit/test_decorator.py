@@ -1,359 +1,731 @@
 """Testes para o decorator @cacheable."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from dapr_state_cache.decorator import CacheableWrapper, cacheable
+from dapr_state_cache.decorator import CacheableWrapper, _backends, _get_backend, _write_batchers, cacheable
 from dapr_state_cache.metrics import InMemoryMetrics
+from tests.helpers import FakeClock
+
+
+@pytest.fixture
+def mock_backend(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Backend mock devolvido por _get_backend (um setattr, sem objeto de patch)."""
+    backend = MagicMock()
+    monkeypatch.setattr("dapr_state_cache.decorator._get_backend", lambda store_name: backend)
+    return backend
 
 
 class TestCacheableDecorator:
     """Testes para o decorator @cacheable."""
 
+    @pytest.mark.usefixtures("mock_backend")
     def test_decorator_without_parens(self) -> None:
         """Deve funcionar sem parênteses."""
-        with patch("dapr_state_cache.decorator._get_backend") as mock_backend:
-            mock_backend.return_value = MagicMock()
 
-            @cacheable
-            def my_func(x: int) -> int:
-                return x * 2
+        @cacheable
+        def my_func(x: int) -> int:
+            return x * 2
 
-            assert isinstance(my_func, CacheableWrapper)
+        assert isinstance(my_func, CacheableWrapper)
 
+    @pytest.mark.usefixtures("mock_backend")
     def test_decorator_with_parens(self) -> None:
         """Deve funcionar com parênteses e argumentos."""
-        with patch("dapr_state_cache.decorator._get_backend") as mock_backend:
-            mock_backend.return_value = MagicMock()
 
-            @cacheable(store_name="custom", ttl_seconds=600)
-            def my_func(x: int) -> int:
-                return x * 2
+        @cacheable(store_name="custom", ttl_seconds=600)
+        def my_func(x: int) -> int:
+            return x * 2
 
-            assert isinstance(my_func, CacheableWrapper)
+        assert isinstance(my_func, CacheableWrapper)
 
+    @pytest.mark.usefixtures("mock_backend")
     def test_preserves_function_name(self) -> None:
         """Deve preservar nome da função."""
-        with patch("dapr_state_cache.decorator._get_backend") as mock_backend:
-            mock_backend.return_value = MagicMock()
 
-            @cacheable
-            def original_name(x: int) -> int:
-                return x
+        @cacheable
+        def original_name(x: int) -> int:
+            return x
 
-            assert original_name.__name__ == "original_name"
+        assert original_name.__name__ == "original_name"
 
+    @pytest.mark.usefixtures("mock_backend")
     def test_preserves_function_doc(self) -> None:
         """Deve preservar docstring da função."""
-        with patch("dapr_state_cache.decorator._get_backend") as mock_backend:
-            mock_backend.return_value = MagicMock()
 
-            @cacheable
-            def documented_func(x: int) -> int:
-                """This is the docstring."""
+        @cacheable
+        def documented_func(x: int) -> int:
+            """This is the docstring."""
+            return x
+
+        assert documented_func.__doc__ == "This is the docstring."
+
+
+class TestGetBackend:
+    """Testes para o compartilhamento de backends entre decorators."""
+
+    def test_same_store_shares_backend(self) -> None:
+        """Decorators do mesmo store devem compartilhar um único backend."""
+        with patch.dict(_backends, clear=True):
+
+            @cacheable(store_name="shared-store")
+            def first(x: int) -> int:
+                return x
+
+            @cacheable(store_name="shared-store")
+            def second(x: int) -> int:
+                return x
+
+            assert first._backend is second._backend
+            assert _get_backend("shared-store") is first._backend
+
+    def test_decoration_does_not_open_connection(self) -> None:
+        """Aplicar o decorator não deve criar clientes HTTP (sidecar pode estar offline)."""
+        with patch.dict(_backends, clear=True):
+
+            @cacheable(store_name="offline-store")
+            def compute(x: int) -> int:
                 return x
 
-            assert documented_func.__doc__ == "This is the docstring."
+            assert compute._backend._sync_client is None
+            assert compute._backend._async_client is None
 
 
 class TestCacheableWrapperSync:
     """Testes para wrapper síncrono."""
 
-    def test_sync_function_cache_miss(self) -> None:
+    def test_sync_function_cache_miss(self, mock_backend: MagicMock) -> None:
         """Deve executar função no cache miss."""
-        mock_backend = MagicMock()
         mock_backend.get.return_value = None
         mock_backend.set.return_value = True
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
+        @cacheable
+        def compute(x: int) -> int:
+            return x * 2
 
-            @cacheable
-            def compute(x: int) -> int:
-                return x * 2
+        result = compute(5)
 
-            result = compute(5)
+        assert result == 10
+        mock_backend.get.assert_called_once()
+        mock_backend.set.assert_called_once()
 
-            assert result == 10
-            mock_backend.get.assert_called_once()
-            mock_backend.set.assert_called_once()
+    def test_default_serializer_does_not_cache_non_native_types(self, mock_backend: MagicMock) -> None:
+        """Com o serializer padrão, valores sem round-trip fiel não são cacheados."""
+        mock_backend.get.return_value = None
 
-    def test_sync_function_cache_hit(self) -> None:
+        @dataclass
+        class Point:
+            x: int
+            y: int
+
+        @cacheable
+        def compute(x: int) -> Point:
+            return Point(x, x)
+
+        assert compute(1) == Point(1, 1)
+        mock_backend.set.assert_not_called()
+
+    def test_sync_function_cache_hit(self, mock_backend: MagicMock) -> None:
         """Deve retornar cache no hit."""
         import msgpack
 
-        mock_backend = MagicMock()
         mock_backend.get.return_value = msgpack.packb(42)
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-            call_count = 0
+        call_count = 0
 
-            @cacheable
-            def compute(x: int) -> int:
-                nonlocal call_count
-                call_count += 1
-                return x * 2
+        @cacheable
+        def compute(x: int) -> int:
+            nonlocal call_count
+            call_count += 1
+            return x * 2
 
-            result = compute(21)
+        result = compute(21)
 
-            assert result == 42
-            assert call_count == 0  # Função não foi chamada
-            mock_backend.set.assert_not_called()
+        assert result == 42
+        assert call_count == 0  # Função não foi chamada
+        mock_backend.set.assert_not_called()
 
-    def test_sync_function_with_metrics(self) -> None:
+    def test_sync_function_with_metrics(self, mock_backend: MagicMock) -> None:
         """Deve registrar métricas."""
-        mock_backend = MagicMock()
         mock_backend.get.return_value = None
         mock_backend.set.return_value = True
         metrics = InMemoryMetrics()
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
+        @cacheable(metrics=metrics)
+        def compute(x: int) -> int:
+            return x * 2
 
-            @cacheable(metrics=metrics)
-            def compute(x: int) -> int:
-                return x * 2
+        compute(5)
+        stats = metrics.get_stats()
+
+        assert stats.misses == 1
+        assert stats.writes == 1
+
+    def test_sync_miss_latency_uses_clock(self, fake_clock: FakeClock, mock_backend: MagicMock) -> None:
+        """Latência do miss deve ser medida pelo relógio do decorator."""
+        mock_backend.get.side_effect = lambda key: fake_clock.advance(0.25)  # Simula latência sem dormir
+        mock_backend.set.return_value = True
+        metrics = InMemoryMetrics()
+
+        @cacheable(metrics=metrics)
+        def compute(x: int) -> int:
+            fake_clock.advance(1.0)  # Tempo da função não conta como latência do cache
+            return x * 2
+
+        compute(5)
+
+        assert metrics.get_stats().miss_latencies == [0.25]
+
+    def test_sync_concurrent_misses_deduplicated(
+        self, mock_backend: MagicMock, sync_waiters: threading.Semaphore
+    ) -> None:
+        """Threads concorrentes com a mesma chave devem executar a função uma vez."""
+        mock_backend.get.return_value = None
+        mock_backend.set.return_value = True
+        call_count = 0
+
+        @cacheable
+        def slow_computation(x: int) -> int:
+            nonlocal call_count
+            call_count += 1
+            # Segura a computação até as outras 4 threads aguardarem
+            for _ in range(4):
+                assert sync_waiters.acquire(timeout=5.0)
+            return x * 2
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(slow_computation, [42] * 5))
+
+        assert results == [84] * 5
+        assert call_count == 1
+        mock_backend.set.assert_called_once()
+
+
+class TestCacheableWrapperLocalCache:
+    """Testes para o cache local (L1) na frente do Dapr."""
 
+    def test_local_cache_avoids_backend_on_repeat_call(self, mock_backend: MagicMock) -> None:
+        """Segunda chamada deve ser servida pelo L1 sem ir ao backend."""
+        mock_backend.get.return_value = None
+        mock_backend.set.return_value = True
+
+        call_count = 0
+
+        @cacheable(local_cache_size=8)
+        def compute(x: int) -> int:
+            nonlocal call_count
+            call_count += 1
+            return x * 2
+
+        assert compute(10) == 20
+        assert compute(10) == 20
+
+        assert call_count == 1
+        mock_backend.get.assert_called_once()
+
+    def test_backend_hit_populates_local_cache(self, mock_backend: MagicMock) -> None:
+        """Hit no backend deve popular o L1."""
+        import msgpack
+
+        mock_backend.get.return_value = msgpack.packb(42)
+
+        @cacheable(local_cache_size=8)
+        def compute(x: int) -> int:
+            return x * 2
+
+        assert compute(21) == 42
+        assert compute(21) == 42
+        mock_backend.get.assert_called_once()
+
+    def test_backend_hit_uses_short_local_ttl(self, mock_backend: MagicMock) -> None:
+        """Valor lido do Dapr fica no L1 só por uma fração do TTL; valor gravado, pelo TTL completo."""
+        import msgpack
+
+        mock_backend.get.side_effect = [msgpack.packb(42), None]
+        mock_backend.set.return_value = True
+
+        @cacheable(ttl_seconds=600, local_cache_size=8)
+        def compute(x: int) -> int:
+            return x * 2
+
+        assert compute._local_cache is not None
+        with patch.object(compute._local_cache, "set", wraps=compute._local_cache.set) as local_set:
+            compute(21)
             compute(5)
-            stats = metrics.get_stats()
 
-            assert stats.misses == 1
-            assert stats.writes == 1
+        assert [c.args[2] for c in local_set.call_args_list] == [60, 600]
+
+    def test_invalidate_clears_local_entry(self, mock_backend: MagicMock) -> None:
+        """Invalidação deve remover a entrada do L1."""
+        mock_backend.get.return_value = None
+        mock_backend.set.return_value = True
+        mock_backend.delete.return_value = True
+
+        @cacheable(local_cache_size=8)
+        def compute(x: int) -> int:
+            return x * 2
+
+        compute(5)
+        compute.invalidate(5)
+        compute(5)
+
+        assert mock_backend.get.call_count == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_async_local_cache(self, mock_backend: MagicMock) -> None:
+        """L1 deve funcionar para funções async, inclusive na invalidação."""
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_async = AsyncMock(return_value=True)
+        mock_backend.delete_async = AsyncMock(return_value=True)
+
+        @cacheable(local_cache_size=8)
+        async def compute(x: int) -> int:
+            return x * 2
+
+        assert await compute(5) == 10
+        assert await compute(5) == 10
+        mock_backend.get_async.assert_called_once()
+
+        await compute.invalidate_async(5)
+        await compute(5)
+        assert mock_backend.get_async.call_count == 2
 
 
 class TestCacheableWrapperAsync:
     """Testes para wrapper assíncrono."""
 
-    @pytest.mark.asyncio
-    async def test_async_function_cache_miss(self) -> None:
+    pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+    async def test_async_function_cache_miss(self, mock_backend: MagicMock) -> None:
         """Deve executar função async no cache miss."""
-        mock_backend = MagicMock()
         mock_backend.get_async = AsyncMock(return_value=None)
         mock_backend.set_async = AsyncMock(return_value=True)
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            @cacheable
-            async def compute(x: int) -> int:
-                return x * 2
+        @cacheable
+        async def compute(x: int) -> int:
+            return x * 2
 
-            result = await compute(5)
+        result = await compute(5)
 
-            assert result == 10
-            mock_backend.get_async.assert_called_once()
-            mock_backend.set_async.assert_called_once()
+        assert result == 10
+        mock_backend.get_async.assert_called_once()
+        mock_backend.set_async.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_async_function_cache_hit(self) -> None:
+    async def test_async_function_cache_hit(self, mock_backend: MagicMock) -> None:
         """Deve retornar cache no hit para async."""
         import msgpack
 
-        mock_backend = MagicMock()
         mock_backend.get_async = AsyncMock(return_value=msgpack.packb(42))
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-            call_count = 0
+        call_count = 0
 
-            @cacheable
-            async def compute(x: int) -> int:
-                nonlocal call_count
-                call_count += 1
+        @cacheable
+        async def compute(x: int) -> int:
+            nonlocal call_count
+            call_count += 1
+            return x * 2
+
+        result = await compute(21)
+
+        assert result == 42
+        assert call_count == 0
+
+    async def test_async_miss_latency_uses_clock(self, fake_clock: FakeClock, mock_backend: MagicMock) -> None:
+        """Latência do miss async deve ser medida pelo relógio do decorator."""
+        mock_backend.get_async = AsyncMock(
+            side_effect=lambda key: fake_clock.advance(0.25)
+        )  # Simula latência sem dormir
+        mock_backend.set_async = AsyncMock(return_value=True)
+        metrics = InMemoryMetrics()
+
+        @cacheable(metrics=metrics)
+        async def compute(x: int) -> int:
+            fake_clock.advance(1.0)  # Tempo da função não conta como latência do cache
+            return x * 2
+
+        await compute(5)
+
+        assert metrics.get_stats().miss_latencies == [0.25]
+
+    async def test_async_batch_writes_single_request(self, mock_backend: MagicMock) -> None:
+        """Com batch_writes, misses concorrentes devem gerar um único envio."""
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_many_async = AsyncMock(return_value=True)
+        mock_backend.set_async = AsyncMock(return_value=True)
+
+        with patch.dict(_write_batchers, clear=True):
+
+            @cacheable(batch_writes=True)
+            async def concurrent_function(x: int) -> int:
                 return x * 2
 
-            result = await compute(21)
+            results = await asyncio.gather(*[concurrent_function(i) for i in range(3)])
+
+            assert results == [0, 2, 4]
+            mock_backend.set_many_async.assert_called_once()
+            mock_backend.set_async.assert_not_called()
+
+    async def test_async_background_write_does_not_delay_result(self, mock_backend: MagicMock) -> None:
+        """Com background_writes, o miss deve retornar antes do fim da escrita."""
+        release_write = asyncio.Event()
+
+        async def slow_set(key: str, value: bytes, ttl_seconds: int) -> bool:
+            await release_write.wait()
+            return True
+
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_async = AsyncMock(side_effect=slow_set)
+        metrics = InMemoryMetrics()
+
+        @cacheable(metrics=metrics, background_writes=True)
+        async def compute(x: int) -> int:
+            return x * 2
+
+        assert await compute(5) == 10
+        assert metrics.get_stats().writes == 0
+
+        release_write.set()
+        await asyncio.gather(*compute._write_tasks.values())
+
+        mock_backend.set_async.assert_awaited_once()
+        assert metrics.get_stats().writes == 1
+
+    async def test_async_background_write_error_is_recorded(self, mock_backend: MagicMock) -> None:
+        """Falha da escrita em segundo plano deve ser registrada nas métricas."""
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_async = AsyncMock(side_effect=Exception("Write error"))
+        metrics = InMemoryMetrics()
+
+        @cacheable(metrics=metrics, background_writes=True)
+        async def compute(x: int) -> int:
+            return x * 2
+
+        assert await compute(5) == 10
+        await asyncio.gather(*compute._write_tasks.values())
+
+        assert metrics.get_stats().errors == 1
+        assert not compute._write_tasks
+
+    async def test_invalidate_async_waits_for_background_write(self, mock_backend: MagicMock) -> None:
+        """Invalidação async deve aguardar a escrita pendente para não ressuscitar o valor."""
+        release_write = asyncio.Event()
+        calls: list[str] = []
+
+        async def slow_set(key: str, value: bytes, ttl_seconds: int) -> bool:
+            await release_write.wait()
+            calls.append("set")
+            return True
+
+        async def delete(key: str) -> bool:
+            calls.append("delete")
+            return True
+
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_async = AsyncMock(side_effect=slow_set)
+        mock_backend.delete_async = AsyncMock(side_effect=delete)
+
+        @cacheable(background_writes=True, local_cache_size=8)
+        async def compute(x: int) -> int:
+            return x * 2
+
+        assert await compute(1) == 2
+        invalidation = asyncio.ensure_future(compute.invalidate_async(1))
+        await asyncio.sleep(0)
+        assert calls == []
+
+        release_write.set()
+        assert await invalidation is True
+
+        assert calls == ["set", "delete"]
+        assert compute._local_cache is not None
+        assert len(compute._local_cache) == 0
+
+    async def test_sync_invalidate_cancels_background_write(self, mock_backend: MagicMock) -> None:
+        """Invalidação sync na thread do loop deve cancelar a escrita pendente da chave."""
+        release_write = asyncio.Event()
+
+        async def slow_set(key: str, value: bytes, ttl_seconds: int) -> bool:
+            await release_write.wait()
+            return True
+
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_async = AsyncMock(side_effect=slow_set)
+        mock_backend.delete.return_value = True
+        metrics = InMemoryMetrics()
+
+        @cacheable(metrics=metrics, background_writes=True)
+        async def compute(x: int) -> int:
+            return x * 2
+
+        assert await compute(1) == 2
+        (write,) = compute._write_tasks.values()
+
+        assert compute.invalidate(1) is True
+        release_write.set()
+        await asyncio.wait({write})
+
+        assert write.cancelled()
+        assert not compute._write_tasks
+        assert metrics.get_stats().writes == 0
+
+    async def test_sync_invalidate_off_loop_thread_waits_for_background_write(self, mock_backend: MagicMock) -> None:
+        """Invalidação sync em outra thread deve aguardar a escrita pendente antes do delete."""
+        write_started = asyncio.Event()
+        release_write = asyncio.Event()
+        calls: list[str] = []
+
+        async def slow_set(key: str, value: bytes, ttl_seconds: int) -> bool:
+            write_started.set()
+            await release_write.wait()
+            calls.append("set")
+            return True
+
+        def delete(key: str) -> bool:
+            calls.append("delete")
+            return True
+
+        mock_backend.get_async = AsyncMock(return_value=None)
+        mock_backend.set_async = AsyncMock(side_effect=slow_set)
+        mock_backend.delete.side_effect = delete
+
+        @cacheable(background_writes=True)
+        async def compute(x: int) -> int:
+            return x * 2
+
+        assert await compute(1) == 2
+        (write,) = compute._write_tasks.values()
+        await write_started.wait()
+
+        invalidating = threading.Event()
 
-            assert result == 42
-            assert call_count == 0
+        def invalidate_in_thread() -> bool:
+            invalidating.set()
+            return compute.invalidate(1)
+
+        invalidation = asyncio.ensure_future(asyncio.to_thread(invalidate_in_thread))
+        # Só libera a escrita com a invalidação já em andamento na outra thread
+        await asyncio.to_thread(invalidating.wait)
+        release_write.set()
+        assert await invalidation is True
+
+        assert not write.cancelled()
+        assert calls == ["set", "delete"]
 
 
 class TestCacheableWrapperInvalidation:
     """Testes para invalidação de cache."""
 
-    def test_invalidate_sync(self) -> None:
+    def test_invalidate_sync(self, mock_backend: MagicMock) -> None:
         """Deve invalidar cache (sync)."""
-        mock_backend = MagicMock()
         mock_backend.get.return_value = None
         mock_backend.set.return_value = True
         mock_backend.delete.return_value = True
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            @cacheable
-            def compute(x: int) -> int:
-                return x * 2
+        @cacheable
+        def compute(x: int) -> int:
+            return x * 2
 
-            compute(5)  # Popula cache
-            result = compute.invalidate(5)
+        compute(5)  # Popula cache
+        result = compute.invalidate(5)
 
-            assert result is True
-            mock_backend.delete.assert_called_once()
+        assert result is True
+        mock_backend.delete.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_invalidate_async(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_invalidate_async(self, mock_backend: MagicMock) -> None:
         """Deve invalidar cache (async)."""
-        mock_backend = MagicMock()
         mock_backend.get_async = AsyncMock(return_value=None)
         mock_backend.set_async = AsyncMock(return_value=True)
         mock_backend.delete_async = AsyncMock(return_value=True)
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
+        @cacheable
+        async def compute(x: int) -> int:
+            return x * 2
+
+        await compute(5)
+        result = await compute.invalidate_async(5)
+
+        assert result is True
+        mock_backend.delete_async.assert_called_once()
+
+    def test_invalidate_many_uses_single_bulk_delete(self, mock_backend: MagicMock) -> None:
+        """Deve remover as chaves de várias chamadas em um único delete_many."""
+        mock_backend.delete.return_value = True
+        mock_backend.delete_many.return_value = True
+
+        @cacheable
+        def compute(x: int, scale: int = 1) -> int:
+            return x * scale
+
+        compute.invalidate(1)
+        compute.invalidate(2, scale=3)
+        expected_keys = [call.args[0] for call in mock_backend.delete.call_args_list]
 
+        result = compute.invalidate_many([((1,), {}), ((2,), {"scale": 3})])
+
+        assert result is True
+        mock_backend.delete_many.assert_called_once_with(expected_keys)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_invalidate_many_async(self, mock_backend: MagicMock) -> None:
+        """Deve invalidar várias entradas em lote (async)."""
+        mock_backend.delete_many_async = AsyncMock(return_value=True)
+
+        @cacheable
+        async def compute(x: int) -> int:
+            return x * 2
+
+        result = await compute.invalidate_many_async([((1,), {}), ((2,), {})])
+
+        assert result is True
+        mock_backend.delete_many_async.assert_awaited_once()
+        assert len(mock_backend.delete_many_async.call_args.args[0]) == 2
+
+    def test_bound_method_invalidate_many(self, mock_backend: MagicMock) -> None:
+        """Deve incluir a instância nas chaves invalidadas de métodos bound."""
+        mock_backend.delete.return_value = True
+        mock_backend.delete_many.return_value = True
+
+        class MyClass:
             @cacheable
-            async def compute(x: int) -> int:
+            def compute(self, x: int) -> int:
                 return x * 2
 
-            await compute(5)
-            result = await compute.invalidate_async(5)
+        obj = MyClass()
+        obj.compute.invalidate(5)
+        obj.compute.invalidate_many([((5,), {})])
 
-            assert result is True
-            mock_backend.delete_async.assert_called_once()
+        mock_backend.delete_many.assert_called_once_with([mock_backend.delete.call_args.args[0]])
 
 
 class TestCacheableWrapperDescriptor:
     """Testes para suporte a métodos via descriptor protocol."""
 
-    def test_instance_method(self) -> None:
+    def test_instance_method(self, mock_backend: MagicMock) -> None:
         """Deve funcionar com métodos de instância."""
-        mock_backend = MagicMock()
         mock_backend.get.return_value = None
         mock_backend.set.return_value = True
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            class MyClass:
-                def __init__(self, multiplier: int) -> None:
-                    self.multiplier = multiplier
+        class MyClass:
+            def __init__(self, multiplier: int) -> None:
+                self.multiplier = multiplier
 
-                @cacheable
-                def compute(self, x: int) -> int:
-                    return x * self.multiplier
+            @cacheable
+            def compute(self, x: int) -> int:
+                return x * self.multiplier
 
-            obj = MyClass(3)
-            result = obj.compute(5)
+        obj = MyClass(3)
+        result = obj.compute(5)
 
-            assert result == 15
+        assert result == 15
 
-    def test_instance_method_invalidate(self) -> None:
+    def test_instance_method_invalidate(self, mock_backend: MagicMock) -> None:
         """Deve invalidar cache de método de instância."""
-        mock_backend = MagicMock()
         mock_backend.get.return_value = None
         mock_backend.set.return_value = True
         mock_backend.delete.return_value = True
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            class MyClass:
-                @cacheable
-                def compute(self, x: int) -> int:
-                    return x * 2
+        class MyClass:
+            @cacheable
+            def compute(self, x: int) -> int:
+                return x * 2
 
-            obj = MyClass()
-            obj.compute(5)
-            result = obj.compute.invalidate(5)
+        obj = MyClass()
+        obj.compute(5)
+        result = obj.compute.invalidate(5)
 
-            assert result is True
+        assert result is True
 
-    def test_descriptor_get_without_instance(self) -> None:
+    def test_descriptor_get_without_instance(self, mock_backend: MagicMock) -> None:
         """Deve retornar wrapper quando acessado da classe."""
-        mock_backend = MagicMock()
-
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
 
-            class MyClass:
-                @cacheable
-                def compute(self, x: int) -> int:
-                    return x * 2
+        class MyClass:
+            @cacheable
+            def compute(self, x: int) -> int:
+                return x * 2
 
-            # Acessando da classe (sem instância)
-            assert isinstance(MyClass.compute, CacheableWrapper)
+        # Acessando da classe (sem instância)
+        assert isinstance(MyClass.compute, CacheableWrapper)
 
 
 class TestCacheableWrapperErrors:
     """Testes para tratamento de erros."""
 
-    def test_sync_cache_get_error(self) -> None:
+    def test_sync_cache_get_error(self, mock_backend: MagicMock) -> None:
         """Deve continuar execução se get falhar."""
-        mock_backend = MagicMock()
         mock_backend.get.side_effect = Exception("Connection error")
         mock_backend.set.return_value = True
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            @cacheable
-            def compute(x: int) -> int:
-                return x * 2
+        @cacheable
+        def compute(x: int) -> int:
+            return x * 2
 
-            result = compute(5)
-            assert result == 10
+        result = compute(5)
+        assert result == 10
 
-    def test_sync_cache_set_error(self) -> None:
+    def test_sync_cache_set_error(self, mock_backend: MagicMock) -> None:
         """Deve continuar se set falhar."""
-        mock_backend = MagicMock()
         mock_backend.get.return_value = None
         mock_backend.set.side_effect = Exception("Write error")
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
+        @cacheable
+        def compute(x: int) -> int:
+            return x * 2
 
-            @cacheable
-            def compute(x: int) -> int:
-                return x * 2
+        result = compute(5)
+        assert result == 10
 
-            result = compute(5)
-            assert result == 10
-
-    @pytest.mark.asyncio
-    async def test_async_cache_get_error(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_async_cache_get_error(self, mock_backend: MagicMock) -> None:
         """Deve continuar execução se get_async falhar."""
-        mock_backend = MagicMock()
         mock_backend.get_async = AsyncMock(side_effect=Exception("Connection error"))
         mock_backend.set_async = AsyncMock(return_value=True)
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            @cacheable
-            async def compute(x: int) -> int:
-                return x * 2
+        @cacheable
+        async def compute(x: int) -> int:
+            return x * 2
 
-            result = await compute(5)
-            assert result == 10
+        result = await compute(5)
+        assert result == 10
 
-    @pytest.mark.asyncio
-    async def test_async_cache_set_error(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_async_cache_set_error(self, mock_backend: MagicMock) -> None:
         """Deve continuar se set_async falhar."""
-        mock_backend = MagicMock()
         mock_backend.get_async = AsyncMock(return_value=None)
         mock_backend.set_async = AsyncMock(side_effect=Exception("Write error"))
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
+        @cacheable
+        async def compute(x: int) -> int:
+            return x * 2
 
-            @cacheable
-            async def compute(x: int) -> int:
-                return x * 2
-
-            result = await compute(5)
-            assert result == 10
+        result = await compute(5)
+        assert result == 10
 
 
 class TestBoundCacheableMethodAsync:
     """Testes para métodos bound assíncronos."""
 
-    @pytest.mark.asyncio
-    async def test_bound_method_invalidate_async(self) -> None:
+    pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+    async def test_bound_method_invalidate_async(self, mock_backend: MagicMock) -> None:
         """Deve invalidar cache de método bound (async)."""
-        mock_backend = MagicMock()
         mock_backend.get_async = AsyncMock(return_value=None)
         mock_backend.set_async = AsyncMock(return_value=True)
         mock_backend.delete_async = AsyncMock(return_value=True)
 
-        with patch("dapr_state_cache.decorator._get_backend", return_value=mock_backend):
-
-            class MyClass:
-                @cacheable
-                async def compute(self, x: int) -> int:
-                    return x * 2
+        class MyClass:
+            @cacheable
+            async def compute(self, x: int) -> int:
+                return x * 2
 
-            obj = MyClass()
-            await obj.compute(5)
-            result = await obj.compute.invalidate_async(5)
+        obj = MyClass()
+        await obj.compute(5)
+        result = await obj.compute.invalidate_async(5)
 
-            assert result is True
-            mock_backend.delete_async.assert_called_once()
+        assert result is True
+        mock_backend.delete_async.assert_called_once()
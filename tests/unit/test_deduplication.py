@@ -2,6 +2,8 @@
 
 import asyncio
 import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -11,7 +13,8 @@ from dapr_state_cache.deduplication import DeduplicationManager
 class TestDeduplicationManager:
     """Testes para DeduplicationManager."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(loop_scope="session")
+
     async def test_single_computation(self) -> None:
         """Deve executar computação única."""
         manager = DeduplicationManager()
@@ -27,7 +30,6 @@ class TestDeduplicationManager:
         assert result == "result"
         assert call_count == 1
 
-    @pytest.mark.asyncio
     async def test_concurrent_calls_deduplicated(self) -> None:
         """Deve deduplicar chamadas concorrentes."""
         manager = DeduplicationManager()
@@ -36,7 +38,7 @@ class TestDeduplicationManager:
         async def compute() -> str:
             nonlocal call_count
             call_count += 1
-            await asyncio.sleep(0.1)  # Simula trabalho
+            await asyncio.sleep(0)  # Cede o loop para os demais chamadores
             return "result"
 
         # Executa 5 chamadas concorrentes
@@ -47,7 +49,6 @@ class TestDeduplicationManager:
         # Mas apenas uma computação deve ter sido executada
         assert call_count == 1
 
-    @pytest.mark.asyncio
     async def test_different_keys_not_deduplicated(self) -> None:
         """Chaves diferentes não devem ser deduplicadas."""
         manager = DeduplicationManager()
@@ -67,72 +68,73 @@ class TestDeduplicationManager:
         assert len(set(results)) == 3  # Resultados diferentes
         assert call_count == 3
 
-    @pytest.mark.asyncio
     async def test_error_propagated_to_all_waiters(self) -> None:
         """Erros devem ser propagados para todos os waiters."""
         manager = DeduplicationManager()
 
         async def compute() -> str:
-            await asyncio.sleep(0.05)
+            await asyncio.sleep(0)
             raise ValueError("computation failed")
 
         # Todas as chamadas devem receber o mesmo erro
         with pytest.raises(ValueError, match="computation failed"):
             await asyncio.gather(*[manager.deduplicate("error_key", compute) for _ in range(3)])
 
-    @pytest.mark.asyncio
     async def test_is_pending(self) -> None:
         """Deve reportar se há computação pendente."""
         manager = DeduplicationManager()
+        release = asyncio.Event()
 
         async def compute() -> str:
-            await asyncio.sleep(0.1)
+            await release.wait()
             return "result"
 
         # Inicia computação
         task = asyncio.create_task(manager.deduplicate("key1", compute))
 
-        # Aguarda um pouco para a computação iniciar
-        await asyncio.sleep(0.01)
+        # Deixa a computação iniciar
+        await asyncio.sleep(0)
 
         # Deve estar pendente
         assert await manager.is_pending("key1")
         assert not await manager.is_pending("key2")
 
         # Aguarda conclusão
+        release.set()
         await task
 
         # Não deve mais estar pendente
         assert not await manager.is_pending("key1")
 
-    @pytest.mark.asyncio
     async def test_pending_count(self) -> None:
         """Deve contar computações pendentes."""
         manager = DeduplicationManager()
+        release = asyncio.Event()
 
         async def compute() -> str:
-            await asyncio.sleep(0.1)
+            await release.wait()
             return "result"
 
         tasks = [asyncio.create_task(manager.deduplicate(f"key{i}", compute)) for i in range(3)]
 
-        await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
         assert await manager.pending_count() == 3
 
+        release.set()
         await asyncio.gather(*tasks)
         assert await manager.pending_count() == 0
 
-    @pytest.mark.asyncio
     async def test_clear_removes_pending(self) -> None:
         """Deve remover computações pendentes ao limpar."""
         manager = DeduplicationManager()
+        release = asyncio.Event()
 
         async def compute() -> str:
-            await asyncio.sleep(0.1)
+            await release.wait()
             return "result"
 
         task = asyncio.create_task(manager.deduplicate("key1", compute))
-        await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
 
         # Verifica que há uma computação pendente
         assert await manager.pending_count() == 1
@@ -143,10 +145,10 @@ class TestDeduplicationManager:
         assert await manager.pending_count() == 0
 
         # Task vai completar ou ser cancelada
+        release.set()
         with contextlib.suppress(asyncio.CancelledError):
             await task
 
-    @pytest.mark.asyncio
     async def test_sequential_calls_not_deduplicated(self) -> None:
         """Chamadas sequenciais não devem ser deduplicadas."""
         manager = DeduplicationManager()
@@ -164,3 +166,169 @@ class TestDeduplicationManager:
         assert result1 == 1
         assert result2 == 2
         assert call_count == 2
+
+    async def test_str_subclass_key_is_accepted(self) -> None:
+        """Chaves que são subclasse de str (KeyBuilder customizado) devem funcionar."""
+
+        class CacheKey(str):
+            pass
+
+        manager = DeduplicationManager()
+
+        async def compute() -> str:
+            return "result"
+
+        assert await manager.deduplicate(CacheKey("key1"), compute) == "result"
+        assert manager.deduplicate_sync(CacheKey("key1"), lambda: "sync") == "sync"
+
+    async def test_clear_does_not_drop_newer_computation(self) -> None:
+        """Computação antiga não deve remover a future de uma nova computação após clear."""
+        manager = DeduplicationManager()
+        release_old = asyncio.Event()
+        release_new = asyncio.Event()
+
+        async def old_compute() -> str:
+            await release_old.wait()
+            return "old"
+
+        async def new_compute() -> str:
+            await release_new.wait()
+            return "new"
+
+        old_task = asyncio.create_task(manager.deduplicate("key1", old_compute))
+        await asyncio.sleep(0)
+        await manager.clear()
+
+        new_task = asyncio.create_task(manager.deduplicate("key1", new_compute))
+        await asyncio.sleep(0)
+        release_old.set()
+        with pytest.raises(asyncio.CancelledError):
+            await old_task
+
+        assert await manager.is_pending("key1")
+        release_new.set()
+        assert await new_task == "new"
+
+    async def test_cancelled_caller_does_not_cancel_shared_computation(self) -> None:
+        """Cancelar o primeiro chamador não deve cancelar a computação dos waiters."""
+        manager = DeduplicationManager()
+        release = asyncio.Event()
+        call_count = 0
+
+        async def compute() -> str:
+            nonlocal call_count
+            call_count += 1
+            await release.wait()
+            return "result"
+
+        owner = asyncio.create_task(manager.deduplicate("key1", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(manager.deduplicate("key1", compute))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+
+        release.set()
+        assert await waiter == "result"
+        assert call_count == 1
+        assert not await manager.is_pending("key1")
+
+
+class TestDeduplicationManagerSync:
+    """Testes para DeduplicationManager.deduplicate_sync."""
+
+    def test_concurrent_threads_deduplicated(self, sync_waiters: threading.Semaphore) -> None:
+        """Deve executar uma única computação para threads concorrentes."""
+        manager = DeduplicationManager()
+        call_count = 0
+
+        def compute() -> str:
+            nonlocal call_count
+            call_count += 1
+            # Segura a computação até as outras 4 threads aguardarem
+            for _ in range(4):
+                assert sync_waiters.acquire(timeout=5.0)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(manager.deduplicate_sync, "same_key", compute) for _ in range(5)]
+            results = [f.result() for f in futures]
+
+        assert results == ["result"] * 5
+        assert call_count == 1
+
+    def test_error_propagated_to_waiting_threads(self, sync_waiters: threading.Semaphore) -> None:
+        """Erros devem ser propagados para as threads aguardando."""
+        manager = DeduplicationManager()
+
+        def compute() -> str:
+            for _ in range(2):
+                assert sync_waiters.acquire(timeout=5.0)
+            raise ValueError("computation failed")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(manager.deduplicate_sync, "error_key", compute) for _ in range(3)]
+
+            for future in futures:
+                with pytest.raises(ValueError, match="computation failed"):
+                    future.result()
+
+    def test_waiter_recomputes_when_owner_aborts_with_base_exception(self, sync_waiters: threading.Semaphore) -> None:
+        """Waiter não deve receber None se o dono for interrompido por BaseException."""
+        manager = DeduplicationManager()
+        owner_started = threading.Event()
+        call_count = 0
+
+        class Abort(BaseException):
+            pass
+
+        def compute() -> str:
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                owner_started.set()
+                # Só interrompe o dono com o waiter já aguardando
+                assert sync_waiters.acquire(timeout=5.0)
+                raise Abort
+            return "recomputed"
+
+        def owner() -> None:
+            with pytest.raises(Abort):
+                manager.deduplicate_sync("key1", compute)
+
+        owner_thread = threading.Thread(target=owner)
+        owner_thread.start()
+        owner_started.wait(timeout=5.0)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(manager.deduplicate_sync, "key1", compute).result(timeout=5.0)
+        owner_thread.join()
+
+        assert result == "recomputed"
+        assert call_count == 2
+
+    def test_reentrant_call_computes_directly(self) -> None:
+        """Chamada reentrante da mesma thread não deve bloquear."""
+        manager = DeduplicationManager()
+
+        def inner() -> str:
+            return "inner"
+
+        def outer() -> str:
+            return manager.deduplicate_sync("key1", inner)
+
+        assert manager.deduplicate_sync("key1", outer) == "inner"
+
+    def test_sequential_calls_not_deduplicated(self) -> None:
+        """Chamadas sequenciais não devem ser deduplicadas."""
+        manager = DeduplicationManager()
+        call_count = 0
+
+        def compute() -> int:
+            nonlocal call_count
+            call_count += 1
+            return call_count
+
+        assert manager.deduplicate_sync("key1", compute) == 1
+        assert manager.deduplicate_sync("key1", compute) == 2
@@ -0,0 +1,16 @@
+"""Testes para a hierarquia de exceções."""
+
+import pytest
+
+from dapr_state_cache.exceptions import CacheConnectionError, CacheError, CacheKeyError, CacheSerializationError
+
+
+@pytest.mark.parametrize("cls", [CacheError, CacheConnectionError, CacheSerializationError, CacheKeyError])
+def test_exception_hierarchy(cls: type[CacheError]) -> None:
+    """Exceções devem herdar de CacheError e preservar mensagem e chave."""
+    error = cls("msg", "k")
+
+    assert isinstance(error, CacheError)
+    assert str(error) == "msg"
+    assert error.key == "k"
+    assert cls("msg").key is None
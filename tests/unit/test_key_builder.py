@@ -1,10 +1,26 @@
 """Testes para o construtor de chaves."""
 
+import gc
+import hashlib
+import json
+from unittest.mock import patch
+
 import pytest
 
 from dapr_state_cache.key_builder import DefaultKeyBuilder
 
 
+class _CustomStr:
+    """Objeto customizado com __str__ (normalizado via str())."""
+
+    def __str__(self) -> str:
+        return "custom_value"
+
+
+class _Unserializable:
+    """Objeto que json.dumps não serializa diretamente (default=str lida)."""
+
+
 class TestDefaultKeyBuilder:
     """Testes para DefaultKeyBuilder."""
 
@@ -85,7 +101,28 @@ class TestDefaultKeyBuilder:
         assert len(parts) == 3
         assert parts[0] == "myprefix"
         assert "sample_function" in parts[1]
-        assert len(parts[2]) == 16  # SHA256 truncado para 16 chars
+        assert len(parts[2]) == 16  # BLAKE2b com digest de 8 bytes
+
+    def test_hash_is_deterministic_across_processes(self) -> None:
+        """Hash não deve depender da seed de hash() do processo."""
+        builder = DefaultKeyBuilder()
+
+        assert builder._hash_arguments((1, "a"), {"b": 2}) == "7ef9befa3faa2fde"
+
+    def test_scalar_fast_path_matches_normalized_hash(self) -> None:
+        """Atalho para argumentos escalares deve gerar o mesmo hash da normalização."""
+        builder = DefaultKeyBuilder()
+        args = (1, "a", 2.5, None, True)
+        kwargs = {"b": 2, "a": "x"}
+
+        with patch.object(builder, "_normalize", wraps=builder._normalize) as normalize:
+            fast = builder._hash_arguments(args, kwargs)
+            normalize.assert_not_called()
+
+        with patch("dapr_state_cache.key_builder._SCALAR_TYPES", frozenset()):
+            normalized = builder._hash_arguments(args, kwargs)
+
+        assert fast == normalized
 
     def test_method_self_filtered(self) -> None:
         """Deve filtrar 'self' de métodos."""
@@ -107,30 +144,26 @@ class TestDefaultKeyBuilder:
         builder = DefaultKeyBuilder(prefix="custom")
         assert builder.prefix == "custom"
 
-    def test_complex_types_in_args(self) -> None:
-        """Deve lidar com tipos complexos nos argumentos."""
-        builder = DefaultKeyBuilder()
-
-        def process(data: dict, items: list) -> None:
-            pass
-
-        key = builder.build_key(
-            process,
+    @pytest.mark.parametrize(
+        "args",
+        [
             ({"nested": {"value": 1}}, [1, 2, 3]),
-            {},
-        )
-
-        assert key.startswith("cache:")
-
-    def test_normalize_bytes(self) -> None:
-        """Deve normalizar bytes para string."""
+            (b"hello",),
+            (frozenset([1, 2, 3]),),
+            (_CustomStr(),),
+            (),
+            (_Unserializable(),),
+        ],
+        ids=["complex_types", "bytes", "frozenset", "custom_object", "empty_args", "json_fallback"],
+    )
+    def test_build_key_handles_argument_types(self, args: tuple[object, ...]) -> None:
+        """Deve construir chave para qualquer tipo de argumento."""
         builder = DefaultKeyBuilder()
 
-        def process(data: bytes) -> None:
+        def process(*values: object) -> None:
             pass
 
-        key = builder.build_key(process, (b"hello",), {})
-        assert key.startswith("cache:")
+        assert builder.build_key(process, args, {}).startswith("cache:")
 
     def test_normalize_set(self) -> None:
         """Deve normalizar set para lista ordenada."""
@@ -144,16 +177,6 @@ class TestDefaultKeyBuilder:
         # Sets com mesmos elementos devem produzir mesma chave
         assert key1 == key2
 
-    def test_normalize_frozenset(self) -> None:
-        """Deve normalizar frozenset para lista ordenada."""
-        builder = DefaultKeyBuilder()
-
-        def process(data: frozenset) -> None:  # type: ignore[type-arg]
-            pass
-
-        key = builder.build_key(process, (frozenset([1, 2, 3]),), {})
-        assert key.startswith("cache:")
-
     def test_normalize_set_with_mixed_types(self) -> None:
         """Deve normalizar set com tipos mistos sem lançar TypeError.
 
@@ -174,29 +197,67 @@ class TestDefaultKeyBuilder:
         key2 = builder.build_key(process, (mixed_set,), {})
         assert key == key2
 
-    def test_normalize_custom_object(self) -> None:
-        """Deve usar str() para objetos customizados."""
+    def test_scalar_set_fast_path_matches_recursive_normalization(self) -> None:
+        """Set só com escalares deve normalizar igual ao caminho recursivo."""
         builder = DefaultKeyBuilder()
+        mixed_set = {1, "string", 3.14, False, None}
 
-        class CustomObj:
-            def __str__(self) -> str:
-                return "custom_value"
+        fast = builder._normalize(mixed_set)
+        with patch("dapr_state_cache.key_builder._SCALAR_TYPES", frozenset()):
+            assert builder._normalize(mixed_set) == fast
 
-        def process(obj: object) -> None:
-            pass
+    def test_hash_matches_json_dumps_payload(self) -> None:
+        """O hash deve continuar igual ao de json.dumps (chaves estáveis entre versões)."""
+        builder = DefaultKeyBuilder()
+        payload = {"args": [1, "a", [1, 2]], "kwargs": {"b": 2.5, "a": None}}
+        expected = hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode(), digest_size=8)
 
-        key = builder.build_key(process, (CustomObj(),), {})
-        assert key.startswith("cache:")
+        assert builder._hash_arguments((1, "a", (1, 2)), {"b": 2.5, "a": None}) == expected.hexdigest()
 
-    def test_empty_args(self) -> None:
-        """Deve lidar com args vazios."""
+    def test_signature_inspected_once_per_function(self) -> None:
+        """inspect.signature deve rodar só na primeira chave de cada função."""
         builder = DefaultKeyBuilder()
 
-        def no_args() -> None:
+        class MyClass:
+            def my_method(self, x: int) -> int:
+                return x
+
+        obj = MyClass()
+        with patch.object(builder, "_is_method", wraps=builder._is_method) as is_method:
+            key1 = builder.build_key(MyClass.my_method, (obj, 1), {})
+            key2 = builder.build_key(MyClass.my_method, (MyClass(), 1), {})
+
+        assert key1 == key2
+        is_method.assert_called_once()
+
+    def test_function_info_memo_released_with_function(self) -> None:
+        """Caminho e flag de método memoizados devem ser descartados quando a função é coletada."""
+        builder = DefaultKeyBuilder()
+
+        def process(x: int) -> int:
+            return x
+
+        key = builder.build_key(process, (1,), {})
+        assert builder.build_key(process, (1,), {}) == key
+        assert len(builder._function_info) == 1
+
+        del process
+        gc.collect()
+
+        assert builder._function_info == {}
+
+    def test_normalize_subclasses_match_base_types(self) -> None:
+        """Subclasses fora do despacho por tipo exato devem normalizar como o tipo base."""
+        builder = DefaultKeyBuilder()
+
+        class MyList(list):  # type: ignore[type-arg]
             pass
 
-        key = builder.build_key(no_args, (), {})
-        assert key.startswith("cache:")
+        class MyDict(dict):  # type: ignore[type-arg]
+            pass
+
+        assert builder._normalize(MyList([1, b"a"])) == builder._normalize([1, b"a"])
+        assert builder._normalize(MyDict(a={2, 1})) == builder._normalize({"a": {1, 2}})
 
     def test_filter_cls_from_classmethod(self) -> None:
         """Deve filtrar 'cls' de métodos de classe."""
@@ -227,18 +288,3 @@ class TestDefaultKeyBuilder:
             assert "None" in key or "unknown" in key
         finally:
             func.__module__ = original_module
-
-    def test_json_serialization_fallback(self) -> None:
-        """Deve usar fallback para tipos não serializáveis em JSON."""
-        builder = DefaultKeyBuilder()
-
-        def process(data: object) -> None:
-            pass
-
-        # Objeto que json.dumps não consegue serializar diretamente
-        # mas o default=str vai lidar com ele
-        class Unserializable:
-            pass
-
-        key = builder.build_key(process, (Unserializable(),), {})
-        assert key.startswith("cache:")
@@ -0,0 +1,69 @@
+"""Testes para o cache local (L1)."""
+
+from unittest.mock import patch
+
+import pytest
+
+from dapr_state_cache.local_cache import LocalCache
+
+
+class TestLocalCache:
+    """Testes para LocalCache."""
+
+    def test_get_missing_key_returns_none(self) -> None:
+        """Deve retornar None para chave inexistente."""
+        cache = LocalCache(max_size=2)
+        assert cache.get("missing") is None
+
+    def test_set_and_get(self) -> None:
+        """Deve retornar valor armazenado."""
+        cache = LocalCache(max_size=2)
+        cache.set("key1", b"value", ttl_seconds=60)
+        assert cache.get("key1") == b"value"
+
+    def test_expired_entry_returns_none(self) -> None:
+        """Entrada expirada deve ser removida e retornar None."""
+        cache = LocalCache(max_size=2)
+
+        with patch("dapr_state_cache.local_cache.time.monotonic", return_value=100.0):
+            cache.set("key1", b"value", ttl_seconds=10)
+        with patch("dapr_state_cache.local_cache.time.monotonic", return_value=110.0):
+            assert cache.get("key1") is None
+
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Deve remover a entrada menos usada ao exceder max_size."""
+        cache = LocalCache(max_size=2)
+        cache.set("key1", b"1", ttl_seconds=60)
+        cache.set("key2", b"2", ttl_seconds=60)
+        cache.get("key1")  # key1 passa a ser a mais recente
+
+        cache.set("key3", b"3", ttl_seconds=60)
+
+        assert cache.get("key2") is None
+        assert cache.get("key1") == b"1"
+        assert cache.get("key3") == b"3"
+
+    def test_delete_and_clear(self) -> None:
+        """Deve remover entradas individualmente e em massa."""
+        cache = LocalCache(max_size=3)
+        cache.set("key1", b"1", ttl_seconds=60)
+        cache.set("key2", b"2", ttl_seconds=60)
+
+        cache.delete("key1")
+        cache.delete("missing")
+        assert cache.get("key1") is None
+        assert len(cache) == 1
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_max_size_raises_error(self) -> None:
+        """max_size não positivo deve lançar erro."""
+        with pytest.raises(ValueError):
+            LocalCache(max_size=0)
+
+    def test_max_size_property(self) -> None:
+        """Deve expor max_size."""
+        assert LocalCache(max_size=5).max_size == 5
@@ -1,6 +1,6 @@
 """Testes para o sistema de métricas."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -84,6 +84,11 @@ class TestKeyStats:
         stats = KeyStats(hits=2, total_latency_hits=0.004)
         assert stats.avg_hit_latency_ms == pytest.approx(2.0)
 
+    def test_uses_slots(self) -> None:
+        """Contadores devem ficar em slots, sem __dict__ por instância."""
+        assert not hasattr(KeyStats(), "__dict__")
+        assert not hasattr(CacheStats(), "__dict__")
+
 
 class TestInMemoryMetrics:
     """Testes para InMemoryMetrics."""
@@ -211,100 +216,74 @@ class TestInMemoryMetrics:
         assert stats.hits == 1000
 
 
+@pytest.fixture
+def mock_otel(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Módulo OpenTelemetry mock usado por OpenTelemetryMetrics (um setattr, sem objeto de patch)."""
+    otel = MagicMock()
+    monkeypatch.setattr("dapr_state_cache.metrics.otel_metrics", otel)
+    return otel
+
+
 class TestOpenTelemetryMetrics:
     """Testes para OpenTelemetryMetrics."""
 
-    def test_init_creates_counters_and_histograms(self) -> None:
+    def test_init_creates_counters_and_histograms(self, mock_otel: MagicMock) -> None:
         """Deve criar counters e histograms na inicialização."""
-        mock_meter = MagicMock()
-        mock_otel = MagicMock()
-        mock_otel.get_meter.return_value = mock_meter
+        mock_meter = mock_otel.get_meter.return_value
 
-        with patch("dapr_state_cache.metrics.otel_metrics", mock_otel):
-            OpenTelemetryMetrics("test_meter")
+        OpenTelemetryMetrics("test_meter")
 
-            mock_otel.get_meter.assert_called_once_with("test_meter")
-            assert mock_meter.create_counter.call_count == 4  # hits, misses, writes, errors
-            assert mock_meter.create_histogram.call_count == 2  # latency, size
+        mock_otel.get_meter.assert_called_once_with("test_meter")
+        assert mock_meter.create_counter.call_count == 4  # hits, misses, writes, errors
+        assert mock_meter.create_histogram.call_count == 2  # latency, size
 
-    def test_init_uses_default_meter_name(self) -> None:
+    def test_init_uses_default_meter_name(self, mock_otel: MagicMock) -> None:
         """Deve usar nome de meter padrão."""
-        mock_meter = MagicMock()
-        mock_otel = MagicMock()
-        mock_otel.get_meter.return_value = mock_meter
+        OpenTelemetryMetrics()
 
-        with patch("dapr_state_cache.metrics.otel_metrics", mock_otel):
-            OpenTelemetryMetrics()
+        mock_otel.get_meter.assert_called_once_with("dapr_state_cache")
 
-            mock_otel.get_meter.assert_called_once_with("dapr_state_cache")
-
-    def test_record_hit(self) -> None:
+    def test_record_hit(self, mock_otel: MagicMock) -> None:
         """Deve registrar cache hit."""
-        mock_meter = MagicMock()
-        mock_counter = MagicMock()
-        mock_histogram = MagicMock()
-        mock_meter.create_counter.return_value = mock_counter
-        mock_meter.create_histogram.return_value = mock_histogram
-
-        mock_otel = MagicMock()
-        mock_otel.get_meter.return_value = mock_meter
+        mock_meter = mock_otel.get_meter.return_value
 
-        with patch("dapr_state_cache.metrics.otel_metrics", mock_otel):
-            metrics = OpenTelemetryMetrics("test_meter")
-            metrics.record_hit("test_key", 0.005)
+        metrics = OpenTelemetryMetrics("test_meter")
+        metrics.record_hit("test_key", 0.005)
 
-            mock_counter.add.assert_called_with(1, {"key": "test_key"})
-            mock_histogram.record.assert_called_with(0.005, {"operation": "hit", "key": "test_key"})
+        mock_meter.create_counter.return_value.add.assert_called_with(1, {"key": "test_key"})
+        mock_meter.create_histogram.return_value.record.assert_called_with(
+            0.005, {"operation": "hit", "key": "test_key"}
+        )
 
-    def test_record_miss(self) -> None:
+    def test_record_miss(self, mock_otel: MagicMock) -> None:
         """Deve registrar cache miss."""
-        mock_meter = MagicMock()
-        mock_counter = MagicMock()
-        mock_histogram = MagicMock()
-        mock_meter.create_counter.return_value = mock_counter
-        mock_meter.create_histogram.return_value = mock_histogram
-
-        mock_otel = MagicMock()
-        mock_otel.get_meter.return_value = mock_meter
+        mock_meter = mock_otel.get_meter.return_value
 
-        with patch("dapr_state_cache.metrics.otel_metrics", mock_otel):
-            metrics = OpenTelemetryMetrics()
-            metrics.record_miss("test_key", 0.003)
+        metrics = OpenTelemetryMetrics()
+        metrics.record_miss("test_key", 0.003)
 
-            mock_counter.add.assert_called_with(1, {"key": "test_key"})
-            mock_histogram.record.assert_called_with(0.003, {"operation": "miss", "key": "test_key"})
+        mock_meter.create_counter.return_value.add.assert_called_with(1, {"key": "test_key"})
+        mock_meter.create_histogram.return_value.record.assert_called_with(
+            0.003, {"operation": "miss", "key": "test_key"}
+        )
 
-    def test_record_write(self) -> None:
+    def test_record_write(self, mock_otel: MagicMock) -> None:
         """Deve registrar escrita no cache."""
-        mock_meter = MagicMock()
-        mock_counter = MagicMock()
-        mock_histogram = MagicMock()
-        mock_meter.create_counter.return_value = mock_counter
-        mock_meter.create_histogram.return_value = mock_histogram
+        mock_meter = mock_otel.get_meter.return_value
 
-        mock_otel = MagicMock()
-        mock_otel.get_meter.return_value = mock_meter
+        metrics = OpenTelemetryMetrics()
+        metrics.record_write("test_key", 2048)
 
-        with patch("dapr_state_cache.metrics.otel_metrics", mock_otel):
-            metrics = OpenTelemetryMetrics()
-            metrics.record_write("test_key", 2048)
+        mock_meter.create_counter.return_value.add.assert_called_with(1, {"key": "test_key"})
+        mock_meter.create_histogram.return_value.record.assert_called_with(2048, {"key": "test_key"})
 
-            mock_counter.add.assert_called_with(1, {"key": "test_key"})
-            mock_histogram.record.assert_called_with(2048, {"key": "test_key"})
-
-    def test_record_error(self) -> None:
+    def test_record_error(self, mock_otel: MagicMock) -> None:
         """Deve registrar erro de cache."""
-        mock_meter = MagicMock()
-        mock_counter = MagicMock()
-        mock_histogram = MagicMock()
-        mock_meter.create_counter.return_value = mock_counter
-        mock_meter.create_histogram.return_value = mock_histogram
-
-        mock_otel = MagicMock()
-        mock_otel.get_meter.return_value = mock_meter
+        mock_meter = mock_otel.get_meter.return_value
 
-        with patch("dapr_state_cache.metrics.otel_metrics", mock_otel):
-            metrics = OpenTelemetryMetrics()
-            metrics.record_error("test_key", ValueError("test error"))
+        metrics = OpenTelemetryMetrics()
+        metrics.record_error("test_key", ValueError("test error"))
 
-            mock_counter.add.assert_called_with(1, {"key": "test_key", "error_type": "ValueError"})
+        mock_meter.create_counter.return_value.add.assert_called_with(
+            1, {"key": "test_key", "error_type": "ValueError"}
+        )
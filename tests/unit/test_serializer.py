@@ -1,9 +1,38 @@
 """Testes para o serializer MsgPack."""
 
+import enum
+import subprocess
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
 import pytest
 
+from dapr_state_cache import protocols
 from dapr_state_cache.exceptions import CacheSerializationError
-from dapr_state_cache.serializer import MsgPackSerializer
+from dapr_state_cache.serializer import MsgPackSerializer, MsgspecSerializer, Serializer
+
+
+@dataclass
+class _Point:
+    x: int
+    y: int
+
+
+class _Color(enum.Enum):
+    RED = "red"
+
+
+# Tipos sem representação nativa em MsgPack: o round-trip não devolveria o mesmo tipo
+_NON_NATIVE_VALUES = [
+    _Point(1, 2),
+    {1, 2},
+    uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+    _Color.RED,
+    datetime(2025, 10, 11, 14, 30),
+]
+_NON_NATIVE_IDS = ["dataclass", "set", "uuid", "enum", "naive_datetime"]
 
 
 class TestMsgPackSerializer:
@@ -101,3 +130,74 @@ class TestMsgPackSerializer:
         assert result["bool"] is True
         assert result["none"] is None
         assert result["list"] == [1, 2, 3]
+
+    @pytest.mark.parametrize("value", _NON_NATIVE_VALUES, ids=_NON_NATIVE_IDS)
+    def test_rejects_types_without_lossless_roundtrip(self, value: object) -> None:
+        """Deve rejeitar tipos que voltariam como outro tipo (valor não é cacheado)."""
+        with pytest.raises(CacheSerializationError):
+            MsgPackSerializer().serialize(value)
+
+    def test_satisfies_serializer_protocol(self) -> None:
+        """Deve satisfazer o protocol Serializer em runtime."""
+        assert isinstance(MsgPackSerializer(), Serializer)
+
+    def test_serializer_protocol_single_definition(self) -> None:
+        """Serializer deve ser o mesmo protocol definido em protocols."""
+        assert Serializer is protocols.Serializer
+
+
+class TestMsgspecSerializer:
+    """Testes para MsgspecSerializer."""
+
+    def test_roundtrip(self) -> None:
+        """Deve serializar e deserializar preservando os dados."""
+        serializer = MsgspecSerializer()
+        data = {"users": [{"id": 1, "name": "Alice"}], "raw": b"\x00\x01", "none": None}
+
+        result = serializer.deserialize(serializer.serialize(data))
+
+        assert result == data
+
+    def test_wire_compatible_with_msgpack_serializer(self) -> None:
+        """Deve ler e escrever o mesmo formato do MsgPackSerializer."""
+        data = {"result": 20, "computed": True, "items": [1, 2, 3]}
+
+        assert MsgspecSerializer().serialize(data) == MsgPackSerializer().serialize(data)
+        assert MsgspecSerializer().deserialize(MsgPackSerializer().serialize(data)) == data
+
+    def test_serialize_unsupported_type_raises_error(self) -> None:
+        """Deve lançar CacheSerializationError para tipos não suportados."""
+        with pytest.raises(CacheSerializationError):
+            MsgspecSerializer().serialize(object())
+
+    def test_deserialize_invalid_data_raises_error(self) -> None:
+        """Deve lançar erro ao deserializar dados inválidos."""
+        with pytest.raises(CacheSerializationError):
+            MsgspecSerializer().deserialize(b"invalid msgpack data \xff\xfe")
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (_Point(1, 2), {"x": 1, "y": 2}),
+            ({1, 2}, [1, 2]),
+            (_Color.RED, "red"),
+        ],
+        ids=["dataclass", "set", "enum"],
+    )
+    def test_roundtrip_is_lossy_for_non_native_types(self, value: object, expected: object) -> None:
+        """Tipos não nativos voltam como tipos MsgPack simples (por isso o serializer é opt-in)."""
+        serializer = MsgspecSerializer()
+
+        assert serializer.deserialize(serializer.serialize(value)) == expected
+
+
+class TestLazyCodecImport:
+    """Testes para o import lazy das bibliotecas de codec."""
+
+    def test_package_import_does_not_load_codecs(self) -> None:
+        """Importar o pacote não deve importar msgpack nem msgspec."""
+        code = "import sys, dapr_state_cache; print(sorted({'msgpack', 'msgspec'} & set(sys.modules)))"
+
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # noqa: S603
+
+        assert result.stdout.strip() == "[]"